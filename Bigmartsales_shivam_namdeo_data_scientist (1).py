@@ -62,15 +62,14 @@ print(df.isnull().sum())
 - For Outlet_Size: Since outlet sizes are categorical (Small, Medium, High), we will fill missing values with the most frequent (mode) outlet size of the respective Outlet_Type.
 """
 
-# missing Item_Weight by filling with the mean weight of the respective Item_Identifier
-df['Item_Weight'] = df.groupby('Item_Identifier')['Item_Weight'].transform(lambda x: x.fillna(x.mean()))
-
-# remaining Item_Weight missing values with overall mean (if any group had all NaN)
-df['Item_Weight'] = df['Item_Weight'].fillna(df['Item_Weight'].mean())
+from bigmart.impute import GroupImputer
 
-# missing Outlet_Size by filling with the most frequent size for each Outlet_Type
-mode_outlet_size = df.groupby('Outlet_Type')['Outlet_Size'].agg(lambda x: x.mode()[0])  # Find mode for each type
-df['Outlet_Size'] = df['Outlet_Size'].fillna(df['Outlet_Type'].map(mode_outlet_size))
+# missing Item_Weight by filling with the mean weight of the respective Item_Identifier
+# (remaining ones with the overall mean, if any group had all NaN), and
+# missing Outlet_Size by filling with the most frequent size for each Outlet_Type.
+# The fitted lookup tables are reused for the test set further below.
+imputer = GroupImputer(mean_by=[('Item_Weight', 'Item_Identifier')], mode_by=[('Outlet_Size', 'Outlet_Type')])
+df = imputer.fit_transform(df)
 
 # Verifying if all missing values are handled
 print("\nMissing Values after fixing:")
@@ -299,12 +298,13 @@ Feature Engineering
 - Encode categorical variables.
 """
 
-# Creating Outlet_Age Feature (Using 2025 as the current year)
-df['Outlet_Age'] = 2025 - df['Outlet_Establishment_Year']
+from bigmart.features import BigMartFeatureEngineer
 
-# Extracting Item Category from Item Identifier
-df['Item_Category'] = df['Item_Identifier'].apply(lambda x: x[:2])
-df['Item_Category'] = df['Item_Category'].replace({'FD': 'Food', 'DR': 'Drinks', 'NC': 'Non-Consumable'})
+# One fitted transformer builds every engineered feature (Outlet_Age using 2025 as the current year,
+# Item_Category, Price_per_Unit_Weight, Item_Visibility_Log, Outlet_Age_Category, Non_Consumable)
+# and is reused unchanged for the test set further below.
+feature_engineer = BigMartFeatureEngineer(current_year=2025)
+df = feature_engineer.fit_transform(df)
 
 # Checking the first few rows
 print(df[['Outlet_Establishment_Year', 'Outlet_Age', 'Item_Identifier', 'Item_Category']].head())
@@ -383,21 +383,12 @@ We will introduce:
 
 import numpy as np
 
-#  1. Price per Unit Weight (Avoid division errors)
-df['Price_per_Unit_Weight'] = df['Item_MRP'] / df['Item_Weight']
-
-#  2. Log Transformation of Item Visibility (Handling Skewness)
-df['Item_Visibility_Log'] = np.log1p(df['Item_Visibility'])  # log1p to avoid log(0) issues
+#  1. Price per Unit Weight, 2. Item_Visibility_Log, 4. Outlet_Age_Category and 5. Non_Consumable
+#  were already added by `feature_engineer` above.
 
 #  3. Encoding Outlet Type (One-Hot Encoding)
 df = pd.get_dummies(df, columns=['Outlet_Type'], drop_first=True)
 
-#  4. Creating Outlet Age Category
-df['Outlet_Age_Category'] = pd.cut(df['Outlet_Age'], bins=[0, 15, 25, 100], labels=['Young', 'Mid', 'Old'])
-
-#  5. Non-Consumable Item Flag (Binary Feature)
-df['Non_Consumable'] = df['Item_Category'].apply(lambda x: 1 if x == 'Non-Consumable' else 0)
-
 #  Checking new features
 print(df[['Price_per_Unit_Weight', 'Item_Visibility_Log', 'Outlet_Age_Category', 'Non_Consumable']].head())
 
@@ -532,8 +523,10 @@ df_encoded["Outlet_Identifier"] = label_encoder.fit_transform(df["Outlet_Identif
 # Display the first few rows of the transformed dataset
 print(df_encoded.head())
 
-# Save the processed data for the next step
-df_encoded.to_csv("encoded_data.csv", index=False)
+# Save the processed data for the next step (typed Feather file; CSV copy kept for download)
+from bigmart.storage import save_frame, load_frame
+
+save_frame(df_encoded, "encoded_data.feather", csv_path="encoded_data.csv")
 
 """Quick Summary of Encoded Data:
 - Categorical variables successfully one-hot encoded, e.g.:
@@ -559,8 +552,8 @@ Features like Item_MRP, Price_per_Unit_Weight, Item_Visibility_Log, etc., will b
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
-# Load the processed dataset
-df = pd.read_csv("/content/encoded_data.csv")
+# Load the processed dataset (memory-mapped, with the dtypes it was saved with)
+df = load_frame("encoded_data.feather")
 
 #  Drop unnecessary columns
 df.drop(["Item_Identifier", "Outlet_Establishment_Year"], axis=1, inplace=True)
@@ -580,10 +573,10 @@ X_train[num_cols] = scaler.fit_transform(X_train[num_cols])
 X_val[num_cols] = scaler.transform(X_val[num_cols])
 
 #  Save Processed Data for Model Training
-X_train.to_csv("X_train.csv", index=False)
-X_val.to_csv("X_val.csv", index=False)
-y_train.to_csv("y_train.csv", index=False)
-y_val.to_csv("y_val.csv", index=False)
+save_frame(X_train, "X_train.feather", csv_path="X_train.csv")
+save_frame(X_val, "X_val.feather", csv_path="X_val.csv")
+save_frame(y_train, "y_train.feather", csv_path="y_train.csv")
+save_frame(y_val, "y_val.feather", csv_path="y_val.csv")
 
 #  Display Final Processed Data Shape
 print("X_train Shape:", X_train.shape)
@@ -776,28 +769,14 @@ print(f"✅ Final Training Dataset Shape: {X_final_train.shape}, Labels Shape: {
 
 test_df = pd.read_csv("/content/test_AbJTz2l.csv")
 
-# Ensure test set has the same feature engineering steps applied
-test_df["Outlet_Age"] = 2025 - test_df["Outlet_Establishment_Year"]
-
-# **Recreate Item_Category from Item_Identifier**
-test_df["Item_Category"] = test_df["Item_Identifier"].apply(lambda x:
-    "Food" if x[0] == "F" else "Drinks" if x[0] == "D" else "Non-Consumable")
-
-# **Recreate Outlet_Age_Category**
-def categorize_outlet_age(age):
-    if age > 25:
-        return "Old"
-    elif age > 15:
-        return "Mid"
-    else:
-        return "New"
+# Keep the identifiers for the submission files instead of re-reading the CSV
+test_ids = test_df[["Item_Identifier", "Outlet_Identifier"]].copy()
 
-test_df["Outlet_Age_Category"] = test_df["Outlet_Age"].apply(categorize_outlet_age)
+# Fill missing Item_Weight / Outlet_Size from the per-item / per-outlet-type tables fitted on train
+test_df = imputer.transform(test_df)
 
-# Apply the same feature engineering as train data
-test_df["Price_per_Unit_Weight"] = test_df["Item_MRP"] / test_df["Item_Weight"]
-test_df["Item_Visibility_Log"] = np.log1p(test_df["Item_Visibility"])
-test_df["Non_Consumable"] = (test_df["Item_Category"] == "Non-Consumable").astype(int)
+# Ensure test set has the same feature engineering steps applied (same fitted transformer as train)
+test_df = feature_engineer.transform(test_df)
 
 # Apply the same categorical encoding as train data
 test_df = pd.get_dummies(test_df, columns=categorical_cols, drop_first=True)
@@ -849,18 +828,8 @@ missing_values_test = test_df.isnull().sum()
 missing_values_test = missing_values_test[missing_values_test > 0]
 print("🔍 Missing Values in Test Data:\n", missing_values_test)
 
-# Fill missing Item_Weight values with the mean (same as train set)
-test_df["Item_Weight"].fillna(test_df["Item_Weight"].mean(), inplace=True)
-
-# Fill missing Item_Weight values explicitly (avoid inplace warning)
-test_df = test_df.copy()  # Ensure we're modifying a copy of the original DataFrame
-test_df["Item_Weight"] = test_df["Item_Weight"].fillna(test_df["Item_Weight"].mean())
-
-# Recalculate Price_per_Unit_Weight after fixing Item_Weight
-test_df["Price_per_Unit_Weight"] = test_df["Item_MRP"] / test_df["Item_Weight"]
-
-# Recalculate Price_per_Unit_Weight after fixing Item_Weight
-test_df["Price_per_Unit_Weight"] = test_df["Item_MRP"] / test_df["Item_Weight"]
+# Item_Weight was already filled with the per-item weights learned on train (`imputer` above),
+# so Price_per_Unit_Weight was computed from imputed weights and needs no recalculation.
 
 # Verify that no missing values remain
 print("✅ Missing Values After Fixing:\n", test_df.isnull().sum().sum())
@@ -870,8 +839,8 @@ test_predictions = final_model.predict(test_df)
 
 #  Create Submission DataFrame
 submission_df = pd.DataFrame({
-    "Item_Identifier": pd.read_csv("/content/test_AbJTz2l.csv")["Item_Identifier"],
-    "Outlet_Identifier": pd.read_csv("/content/test_AbJTz2l.csv")["Outlet_Identifier"],
+    "Item_Identifier": test_ids["Item_Identifier"],
+    "Outlet_Identifier": test_ids["Outlet_Identifier"],
     "Item_Outlet_Sales": test_predictions
 })
 
@@ -1026,8 +995,8 @@ test_predictions = best_model.predict(test_df)
 
 # Create Submission DataFrame
 submission_df = pd.DataFrame({
-    "Item_Identifier": pd.read_csv("/content/test_AbJTz2l.csv")["Item_Identifier"],
-    "Outlet_Identifier": pd.read_csv("/content/test_AbJTz2l.csv")["Outlet_Identifier"],
+    "Item_Identifier": test_ids["Item_Identifier"],
+    "Outlet_Identifier": test_ids["Outlet_Identifier"],
     "Item_Outlet_Sales": test_predictions
 })
 
@@ -0,0 +1,20 @@
+"""BigMart sales prediction: reusable preprocessing and scoring components."""
+
+from bigmart.artifact import ARTIFACT_VERSION, ModelArtifact, load_artifact, save_artifact
+from bigmart.dimensions import DimensionTables
+from bigmart.features import BigMartFeatureEngineer
+from bigmart.impute import GroupImputer
+from bigmart.layout import FeatureLayout
+from bigmart.preprocessing import BigMartPreprocessor
+
+__all__ = [
+    "ARTIFACT_VERSION",
+    "BigMartFeatureEngineer",
+    "BigMartPreprocessor",
+    "DimensionTables",
+    "FeatureLayout",
+    "GroupImputer",
+    "ModelArtifact",
+    "load_artifact",
+    "save_artifact",
+]
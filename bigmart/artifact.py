@@ -0,0 +1,138 @@
+"""Versioned on-disk bundle of a fitted model and its preprocessing.
+
+Scoring loads this file instead of re-running the notebook, so cold start is
+dominated by the file read.
+"""
+
+import time
+import warnings
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+import joblib
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from bigmart import profiling
+from bigmart.dimensions import DimensionTables
+from bigmart.layout import FeatureLayout
+
+# Bump when the layout of ModelArtifact or BigMartPreprocessor changes
+ARTIFACT_VERSION = 5
+
+
+@dataclass
+class ModelArtifact:
+    """A fitted estimator plus the BigMartPreprocessor it was trained behind."""
+
+    model: object
+    preprocessor: object
+    model_name: str = ""
+    metadata: dict = field(default_factory=dict)
+    version: int = ARTIFACT_VERSION
+    _layout: object = field(default=None, init=False, repr=False, compare=False)
+    _dimensions: object = field(default=None, init=False, repr=False, compare=False)
+    # Thread limit for predictions in this process (set_threads; not persisted)
+    _threads: int = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def label_encoder(self):
+        return self.preprocessor.label_encoder_
+
+    @property
+    def encoder(self):
+        return self.preprocessor.encoder_
+
+    @property
+    def scaler(self):
+        return self.preprocessor.scaler_
+
+    @property
+    def feature_columns(self):
+        return list(self.preprocessor.feature_names_out_)
+
+    @property
+    def layout(self):
+        """FeatureLayout compiled from the preprocessor on first use (not persisted)."""
+        if self._layout is None:
+            dtype = np.float32 if self.preprocessor.compact else np.float64
+            self._layout = FeatureLayout(self.preprocessor, dtype=dtype)
+        return self._layout
+
+    @property
+    def dimensions(self):
+        """DimensionTables built from the preprocessor on first use (not persisted)."""
+        if self._dimensions is None:
+            self._dimensions = DimensionTables(self.preprocessor)
+        return self._dimensions
+
+    def transform(self, raw_df):
+        return self.preprocessor.transform(raw_df)
+
+    def predict(self, raw_df):
+        """Predict Item_Outlet_Sales for raw (un-preprocessed) rows.
+
+        Known items and outlets are gathered from the dimension tables; others
+        go through the full preprocessing.
+        """
+        with profiling.span("artifact.transform", rows=len(raw_df)):
+            X = self.dimensions.transform(raw_df)
+        return self.predict_matrix(X)
+
+    def predict_records(self, records):
+        """Predict Item_Outlet_Sales for raw record dicts via the compiled layout."""
+        return self.predict_matrix(self.layout.transform_records(records))
+
+    def predict_matrix(self, X):
+        """Predict from an already built feature matrix in feature_columns order."""
+        limits = threadpool_limits(limits=self._threads) if self._threads else nullcontext()
+        with profiling.span("model.predict", rows=len(X), model=self.model_name), warnings.catch_warnings(), limits:
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return predict_model(self.model, X, threads=self._threads)
+
+    def set_threads(self, threads):
+        """Run predictions on at most `threads` threads (None: the libraries' defaults)."""
+        self._threads = threads
+        # Flattened models (bigmart.flat_trees) have no sklearn params
+        if threads and "n_jobs" in getattr(self.model, "get_params", dict)():
+            self.model.set_params(n_jobs=threads)
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_layout"] = None
+        state["_dimensions"] = None
+        state["_threads"] = None
+        return state
+
+
+def predict_model(model, X, threads=None):
+    """model's predictions for a feature matrix.
+
+    LightGBM goes straight to its booster, skipping the sklearn wrapper's
+    DataFrame validation (and its n_jobs, so threads is passed to the
+    booster as num_threads). Callers passing arrays to models fitted on
+    DataFrames silence sklearn's feature-name warning themselves:
+    warnings.catch_warnings is not thread-safe.
+    """
+    booster = getattr(model, "booster_", None)
+    if booster is None:
+        return model.predict(X)
+    return booster.predict(X, num_threads=threads) if threads else booster.predict(X)
+
+
+def save_artifact(artifact, path, compress=0):
+    artifact.metadata.setdefault("saved_at", time.strftime("%Y-%m-%dT%H:%M:%S"))
+    joblib.dump(artifact, path, compress=compress)
+    return path
+
+
+def load_artifact(path):
+    artifact = joblib.load(path)
+    if not isinstance(artifact, ModelArtifact):
+        raise TypeError(f"{path} does not contain a ModelArtifact")
+    if artifact.version != ARTIFACT_VERSION:
+        raise ValueError(
+            f"{path} has artifact version {artifact.version}, expected {ARTIFACT_VERSION}; retrain with bigmart.train"
+        )
+    return artifact
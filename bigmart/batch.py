@@ -0,0 +1,79 @@
+"""Chunked batch scoring for input files larger than memory.
+
+The input CSV is read once, chunk by chunk; each chunk goes through the
+fitted preprocessing and model and is appended to the output file, so peak
+memory depends on the chunk size, not on the input size.
+
+With n_jobs > 1 the chunks are fanned out to a process pool. Every worker
+loads the model artifact once at start-up and results are written back in
+the original row order.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bigmart.artifact import load_artifact
+from bigmart.dtypes import read_raw_csv
+from bigmart.predict import ID_COLUMNS, predict_frame
+from bigmart.processes import resolve_n_jobs
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Artifact loaded once per worker process by _init_worker
+_worker_artifact = None
+
+
+def iter_predictions(artifact, input_csv, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield a submission frame for every chunk of the input CSV."""
+    for chunk in read_raw_csv(input_csv, chunksize=chunksize):
+        yield predict_frame(artifact, chunk)
+
+
+def score_csv_in_chunks(artifact, input_csv, output_csv, chunksize=DEFAULT_CHUNKSIZE):
+    """Score input_csv into output_csv one chunk at a time; returns the row count."""
+    return _write_submissions(iter_predictions(artifact, input_csv, chunksize=chunksize), output_csv)
+
+
+def score_csv_parallel(artifact_path, input_csv, output_csv, chunksize=DEFAULT_CHUNKSIZE, n_jobs=-1):
+    """Score input_csv across a process pool; returns the row count.
+
+    At most 2 * n_jobs chunks are in flight at once, so memory stays bounded
+    while every worker has a queued shard. Each worker's model is limited to
+    one thread, so n_jobs processes use n_jobs cores.
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    with ProcessPoolExecutor(n_jobs, initializer=_init_worker, initargs=(artifact_path,)) as pool:
+        return _write_submissions(_iter_parallel(pool, input_csv, chunksize, 2 * n_jobs), output_csv)
+
+
+def _iter_parallel(pool, input_csv, chunksize, max_pending):
+    pending = deque()
+    for chunk in read_raw_csv(input_csv, chunksize=chunksize):
+        pending.append(pool.submit(_predict_shard, chunk))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _init_worker(artifact_path):
+    global _worker_artifact
+    # One thread per worker: n_jobs workers use n_jobs cores
+    _worker_artifact = load_artifact(artifact_path).set_threads(1)
+
+
+def _predict_shard(chunk):
+    return predict_frame(_worker_artifact, chunk)
+
+
+def _write_submissions(submissions, output_csv):
+    n_rows = 0
+    with open(output_csv, "w", newline="") as out:
+        for submission_df in submissions:
+            submission_df.to_csv(out, header=n_rows == 0, index=False)
+            n_rows += len(submission_df)
+        if n_rows == 0:
+            pd.DataFrame(columns=ID_COLUMNS + ["Item_Outlet_Sales"]).to_csv(out, index=False)
+    return n_rows
@@ -0,0 +1,193 @@
+"""Benchmark every training pipeline stage at several data sizes.
+
+    python -m bigmart.benchmark train_v9rqX0R.csv -o benchmark_results.json
+    python -m bigmart.benchmark train_v9rqX0R.csv --sizes 1 10 100 1000
+    python -m bigmart.benchmark train_v9rqX0R.csv --baseline benchmark_baseline.json --tolerance 0.25
+    python -m bigmart.benchmark train_v9rqX0R.csv --baseline benchmark_baseline.json --update-baseline
+    python -m bigmart.benchmark train_v9rqX0R.csv --synthetic --sizes 100 1000
+
+Each size is the training file expanded `size` times (see expand_frame).
+With --synthetic, it is instead about `size` times the training rows of
+data generated by bigmart.synthetic, streamed straight to disk.
+For every size, load -> impute -> clean -> engineer -> encode ->
+split/scale -> fit -> predict is timed stage by stage. Wall time, rows/sec
+and peak RSS go to a JSON results file.
+
+With --baseline, a stage that is more than --tolerance slower than the
+baseline (and at least --min-delta seconds slower, to ignore timer noise on
+tiny stages) is reported and the command exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+
+from bigmart.dtypes import read_raw_csv
+from bigmart.models import DEFAULT_MODEL
+from bigmart.pipeline import training_stages
+from bigmart.preprocessing import TARGET
+from bigmart.processes import peak_rss_mb, reset_peak_rss
+from bigmart.synthetic import BigMartSynthesizer
+
+DEFAULT_SIZES = (1, 10, 100)
+
+
+def expand_frame(df, factor, random_state=42):
+    """factor copies of a raw training frame, each with its own items.
+
+    Copy k > 0 suffixes Item_Identifier with "_k" (keeping the two-letter
+    category prefix), so the number of item groups grows with the data. It
+    also jitters Item_MRP, Item_Visibility and the target by up to ±10%.
+    """
+    if factor == 1:
+        return df.copy()
+    rng = np.random.default_rng(random_state)
+    out = df.iloc[np.tile(np.arange(len(df)), factor)].reset_index(drop=True)
+    copy = np.repeat(np.arange(factor), len(df))
+    suffix = np.where(copy == 0, "", "_" + pd.Series(copy).astype(str))
+    out["Item_Identifier"] = out["Item_Identifier"] + suffix
+    for column in ("Item_MRP", "Item_Visibility", TARGET):
+        if column in out:
+            jitter = np.where(copy == 0, 1.0, rng.uniform(0.9, 1.1, len(out)))
+            out[column] = out[column] * jitter
+    return out
+
+
+def _timed(fn, *args, repeat=1, **kwargs):
+    """(result of the last run, best wall time, peak RSS in MB).
+
+    The stages fit their preprocessor and change their input in place, so
+    with repeat > 1 every run gets its own deep copy of args, made outside
+    the timed region.
+    """
+    best = np.inf
+    reset_peak_rss()
+    for _ in range(repeat):
+        run_args = deepcopy(args) if repeat > 1 else args
+        started = time.perf_counter()
+        result = fn(*run_args, **kwargs)
+        best = min(best, time.perf_counter() - started)
+    return result, best, peak_rss_mb()
+
+
+def benchmark_size(df, factor, model_name=DEFAULT_MODEL, repeat=1, workdir=None, synthesizer=None):
+    """One result row per stage for df expanded factor times (or synthesized at that scale)."""
+    path = os.path.join(workdir or tempfile.gettempdir(), f"bigmart_benchmark_{factor}x.csv")
+    if synthesizer is not None:
+        n_outlets = len(synthesizer.outlets_)
+        synthesizer.write_csv(path, n_items=-(-factor * len(df) // n_outlets), n_outlets=n_outlets)
+    else:
+        expanded = expand_frame(df, factor)
+        expanded.to_csv(path, index=False)
+        del expanded
+    n_rows = None
+
+    def row(stage, seconds, peak_mb):
+        return {
+            "size": factor,
+            "rows": n_rows,
+            "stage": stage,
+            "seconds": seconds,
+            "rows_per_sec": n_rows / seconds if seconds > 0 else None,
+            "peak_rss_mb": peak_mb,
+        }
+
+    try:
+        raw_df, seconds, peak = _timed(read_raw_csv, path, repeat=repeat)
+        n_rows = len(raw_df)
+        rows = [row("load", seconds, peak)]
+        value = raw_df
+        for stage in training_stages(model_name=model_name):
+            value, seconds, peak = _timed(stage.fn, value, repeat=repeat, **stage.params)
+            rows.append(row(stage.name, seconds, peak))
+        _, seconds, peak = _timed(value.predict, raw_df, repeat=repeat)
+        rows.append(row("predict", seconds, peak))
+    finally:
+        os.remove(path)
+    return rows
+
+
+def run_benchmarks(train_csv, sizes=DEFAULT_SIZES, model_name=DEFAULT_MODEL, repeat=1, synthetic=False):
+    df = pd.read_csv(train_csv)
+    synthesizer = BigMartSynthesizer().fit(df) if synthetic else None
+    results = []
+    for factor in sizes:
+        print(f"🔄 {factor}x ({factor * len(df):,} rows)... ⏳")
+        for r in benchmark_size(df, factor, model_name=model_name, repeat=repeat, synthesizer=synthesizer):
+            print(f"   {r['stage']:<12} {r['seconds']:9.3f}s {r['rows_per_sec'] or 0:14,.0f} rows/s "
+                  f"{r['peak_rss_mb']:9.0f} MB")
+            results.append(r)
+    return {
+        "model": model_name,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "data": "synthetic" if synthetic else "expanded",
+        "results": results,
+    }
+
+
+def find_regressions(results, baseline, tolerance=0.25, min_delta=0.05):
+    """Stages slower than the baseline by more than tolerance (relative) and min_delta seconds."""
+    expected = {(r["size"], r["stage"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for r in results["results"]:
+        base = expected.get((r["size"], r["stage"]))
+        if base is None:
+            continue
+        if r["seconds"] > base * (1 + tolerance) and r["seconds"] - base > min_delta:
+            regressions.append({**r, "baseline_seconds": base, "slowdown": r["seconds"] / base})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("train_csv")
+    parser.add_argument("-o", "--output", default="benchmark_results.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="expansion factors")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per stage; the fastest is kept")
+    parser.add_argument("--synthetic", action="store_true", help="generate each size with bigmart.synthetic")
+    parser.add_argument("--baseline", default=None, help="baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="ignore slowdowns smaller than this (s)")
+    parser.add_argument("--update-baseline", action="store_true", help="write these results to --baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.train_csv, sizes=args.sizes, model_name=args.model, repeat=args.repeat, synthetic=args.synthetic
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved to {args.output}")
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, tolerance=args.tolerance, min_delta=args.min_delta)
+    for r in regressions:
+        print(f"❌ {r['stage']} at {r['size']}x: {r['seconds']:.3f}s vs {r['baseline_seconds']:.3f}s "
+              f"baseline ({r['slowdown']:.2f}x)")
+    if regressions:
+        return 1
+    print(f"✅ No stage slower than baseline by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""Item and outlet dimension tables for gather-based scoring.
+
+Every item attribute (Item_Weight, Item_Fat_Content, Item_Type and the
+derived Item_Category / Non_Consumable) is constant per Item_Identifier, and
+every outlet attribute (Outlet_Size, Outlet_Location_Type, Outlet_Type,
+Outlet_Age, ...) is constant per Outlet_Identifier. DimensionTables encodes
+each item and each outlet once, through the fitted BigMartPreprocessor, into
+a row of a compact feature block. Scoring a frame is then an integer gather
+from those blocks plus the few per-row features computed from Item_MRP and
+Item_Visibility.
+
+Item_Weight is treated as a per-row feature: a weight given on the row is
+used as is, and a missing one is taken from the item table, exactly like the
+imputer. The other attributes of a known item or outlet come from the
+tables, for the rows whose own values (cleaned and imputed as the
+preprocessor does) agree with the tables. Rows that disagree, or whose item
+or outlet was not seen at fit time, fall back to the full
+BigMartPreprocessor.transform path, so the output always matches it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from bigmart.impute import lookup
+from bigmart.preprocessing import FAT_CONTENT_MAP, ITEM_ATTRIBUTES, NUM_COLS, OUTLET_ATTRIBUTES
+
+ITEM_FEATURES = ("Non_Consumable",)
+ITEM_FEATURE_PREFIXES = ("Item_Fat_Content_", "Item_Category_", "Item_Type_")
+OUTLET_FEATURES = ("Outlet_Identifier", "Outlet_Age")
+OUTLET_FEATURE_PREFIXES = ("Outlet_Type_", "Outlet_Size_", "Outlet_Location_Type_", "Outlet_Age_Category_")
+# Per-row features: Item_Weight, Item_Visibility, Item_MRP, Price_per_Unit_Weight, Item_Visibility_Log
+# Raw attributes a row must share with its item / outlet table entry to be gathered
+ITEM_CHECKED = [c for c in ITEM_ATTRIBUTES if c != "Item_Weight"]
+OUTLET_CHECKED = list(OUTLET_ATTRIBUTES)
+
+
+def _is_item_feature(name):
+    return name in ITEM_FEATURES or name.startswith(ITEM_FEATURE_PREFIXES)
+
+
+def _is_outlet_feature(name):
+    return name in OUTLET_FEATURES or name.startswith(OUTLET_FEATURE_PREFIXES)
+
+
+def _cleaned(values, column):
+    """values as the preprocessor encodes them (Item_Fat_Content spellings merged)."""
+    return values.replace(FAT_CONTENT_MAP) if column == "Item_Fat_Content" else values
+
+
+def _agree(values, table, codes):
+    """values == table[codes] elementwise, with NaN equal to NaN."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Compare category codes; a table value outside the categories never matches
+        table_codes = values.cat.categories.get_indexer(table)
+        table_codes[(table_codes < 0) & pd.notna(table)] = -2
+        return values.cat.codes.to_numpy() == table_codes[codes]
+    values, expected = values.to_numpy(dtype=object), table[codes]
+    return (values == expected) | (pd.isna(values) & pd.isna(expected))
+
+
+class DimensionTables:
+    """Encoded item/outlet feature blocks keyed by integer item and outlet codes.
+
+    item_index / outlet_index map identifiers to codes (rows of item_block /
+    outlet_block); item_weights holds the imputed raw weight per item for
+    Price_per_Unit_Weight. Output matrices are float32 for a compact
+    preprocessor and float64 otherwise.
+    """
+
+    def __init__(self, preprocessor):
+        self.preprocessor = preprocessor
+        self.dtype = np.float32 if preprocessor.compact else np.float64
+        self.columns = list(preprocessor.feature_names_out_)
+        self.item_slots = np.array([i for i, c in enumerate(self.columns) if _is_item_feature(c)])
+        self.outlet_slots = np.array([i for i, c in enumerate(self.columns) if _is_outlet_feature(c)])
+
+        items = preprocessor.item_attributes_
+        outlets = preprocessor.outlet_attributes_
+        self.item_index = pd.Index(items.index)
+        self.outlet_index = pd.Index(outlets.index)
+        # The imputer's per-item mean, which is what a row with a missing weight receives
+        imputer = preprocessor.imputer_
+        item_means = lookup(imputer.means_["Item_Weight"], self.item_index).astype(float)
+        self.item_weights = np.where(np.isnan(item_means), imputer.fallbacks_["Item_Weight"], item_means)
+
+        # Encode each item against one reference outlet, and each outlet against one reference item
+        reference_item = items.iloc[[0]].reset_index()
+        reference_outlet = outlets.iloc[[0]].reset_index()
+        per_row = {"Item_MRP": 1.0, "Item_Visibility": preprocessor.visibility_median_}
+        item_rows = items.reset_index().assign(**per_row, **reference_outlet.iloc[0].to_dict())
+        outlet_rows = outlets.reset_index().assign(**per_row, **reference_item.iloc[0].to_dict())
+        self.item_block = preprocessor.transform(item_rows).to_numpy(dtype=float)[:, self.item_slots]
+        self.outlet_block = preprocessor.transform(outlet_rows).to_numpy(dtype=float)[:, self.outlet_slots]
+        self.item_values = {c: _cleaned(items[c], c).to_numpy(dtype=object) for c in ITEM_CHECKED}
+        self.outlet_values = {c: outlets[c].to_numpy(dtype=object) for c in OUTLET_CHECKED}
+
+        index = {c: i for i, c in enumerate(self.columns)}
+        scaler = preprocessor.scaler_
+        self.numeric_slots = {c: (index[c], scaler.mean_[j], scaler.scale_[j]) for j, c in enumerate(NUM_COLS)}
+
+    def codes(self, df):
+        """Integer item and outlet codes for a frame (-1 where unseen)."""
+        return (
+            self.item_index.get_indexer(df["Item_Identifier"]),
+            self.outlet_index.get_indexer(df["Outlet_Identifier"]),
+        )
+
+    def matches(self, df, item_codes, outlet_codes):
+        """Rows whose item and outlet attributes agree with the tables at their (known) codes."""
+        imputer = self.preprocessor.imputer_
+        groups = dict(imputer.mode_by)
+        checks = [(c, t, item_codes) for c, t in self.item_values.items()]
+        checks += [(c, t, outlet_codes) for c, t in self.outlet_values.items()]
+        agree = np.ones(len(df), dtype=bool)
+        for column, table, codes in checks:
+            codes = np.maximum(codes, 0)
+            values = _cleaned(df[column], column)
+            same = _agree(values, table, codes)
+            missing = np.flatnonzero(values.isna().to_numpy())
+            if column in groups and len(missing):
+                # A missing value is compared as the imputer fills it
+                filled = lookup(imputer.modes_[column], df[groups[column]].to_numpy()[missing])
+                expected = table[codes[missing]]
+                same[missing] = (filled == expected) | (pd.isna(filled) & pd.isna(expected))
+            agree &= same
+        return agree
+
+    def transform_codes(self, item_codes, outlet_codes, item_mrp, item_visibility, item_weight=None, out=None):
+        """Feature matrix for known item/outlet codes and per-row MRP/visibility (and optional weight)."""
+        item_codes = np.asarray(item_codes)
+        if out is None:
+            out = np.empty((len(item_codes), len(self.columns)), dtype=self.dtype)
+        out[:, self.item_slots] = self.item_block[item_codes]
+        out[:, self.outlet_slots] = self.outlet_block[np.asarray(outlet_codes)]
+
+        weight = self.item_weights[item_codes]
+        if item_weight is not None:
+            item_weight = np.asarray(item_weight, dtype=float)
+            weight = np.where(np.isnan(item_weight), weight, item_weight)
+        mrp = np.asarray(item_mrp, dtype=float)
+        visibility = np.asarray(item_visibility, dtype=float)
+        visibility = np.where(visibility == 0, self.preprocessor.visibility_median_, visibility)
+        per_row = {
+            "Item_Weight": weight,
+            "Item_Visibility": visibility,
+            "Item_MRP": mrp,
+            "Price_per_Unit_Weight": mrp / weight,
+            "Item_Visibility_Log": np.log1p(visibility),
+        }
+        for name, values in per_row.items():
+            slot, mean, scale = self.numeric_slots[name]
+            out[:, slot] = (values - mean) / scale
+        return out
+
+    def transform(self, df):
+        """Feature matrix for raw rows, matching BigMartPreprocessor.transform.
+
+        Rows with a known item and outlet whose attributes agree with the
+        tables are gathered; the rest go through the preprocessor.
+        """
+        item_codes, outlet_codes = self.codes(df)
+        known = (item_codes >= 0) & (outlet_codes >= 0)
+        known &= self.matches(df, item_codes, outlet_codes)
+        out = np.empty((len(df), len(self.columns)), dtype=self.dtype)
+        per_row = [df[c].to_numpy(dtype=float) for c in ("Item_MRP", "Item_Visibility", "Item_Weight")]
+        if known.all():
+            return self.transform_codes(item_codes, outlet_codes, *per_row, out=out)
+        out[known] = self.transform_codes(item_codes[known], outlet_codes[known], *(v[known] for v in per_row))
+        if (~known).any():
+            out[~known] = self.preprocessor.transform(df[~known]).to_numpy(dtype=self.dtype)
+        return out
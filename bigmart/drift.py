@@ -0,0 +1,83 @@
+"""Distribution drift between the training features and a new batch.
+
+At fit time the numeric model inputs (NUM_COLS, after scaling) are
+summarised as decile histograms and stored in the artifact metadata. A new
+batch is transformed with the same preprocessor and compared bin by bin
+with the Population Stability Index:
+
+    PSI = sum((new% - ref%) * ln(new% / ref%))
+
+By the usual rule of thumb, PSI < 0.1 is stable, 0.1-0.2 is a moderate
+shift and > 0.2 is a significant shift.
+"""
+
+import warnings
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from bigmart.preprocessing import NUM_COLS
+
+DEFAULT_BINS = 10
+DEFAULT_MAX_PSI = 0.2
+_EPS = 1e-4
+
+
+def reference_histograms(X, columns=NUM_COLS, bins=DEFAULT_BINS):
+    """{column: {"edges", "fractions"}} with quantile bin edges, JSON-serializable."""
+    reference = {}
+    for col in columns:
+        values = np.asarray(X[col], dtype=float)
+        values = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        reference[col] = {"edges": edges.tolist(), "fractions": _fractions(values, edges).tolist()}
+    return reference
+
+
+def _fractions(values, edges):
+    # Bins are open at both ends, so values outside the training range still count
+    counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+    return counts / max(counts.sum(), 1)
+
+
+def population_stability(reference, X):
+    """{column: PSI of X[column] against its reference histogram}."""
+    psi = {}
+    for col, ref in reference.items():
+        values = np.asarray(X[col], dtype=float)
+        expected = np.clip(np.asarray(ref["fractions"]), _EPS, None)
+        actual = np.clip(_fractions(values[~np.isnan(values)], np.asarray(ref["edges"])), _EPS, None)
+        psi[col] = float(np.sum((actual - expected) * np.log(actual / expected)))
+    return psi
+
+
+@dataclass
+class DriftReport:
+    psi: dict = field(default_factory=dict)
+    # {column: levels the fitted encoders have not seen}
+    unseen: dict = field(default_factory=dict)
+    rows: int = 0
+
+    @property
+    def max_psi(self):
+        return max(self.psi.values(), default=0.0)
+
+    def exceeds(self, max_psi=DEFAULT_MAX_PSI):
+        """True when the batch needs a full rebuild rather than an update."""
+        return self.max_psi > max_psi or bool(self.unseen)
+
+
+def measure_drift(artifact, raw_df):
+    """DriftReport of raw rows against the artifact's training features."""
+    reference = artifact.metadata.get("drift_reference")
+    if reference is None:
+        raise ValueError("artifact has no drift_reference; retrain it with bigmart.train")
+    with warnings.catch_warnings():
+        # Unseen levels are reported below instead
+        warnings.filterwarnings("ignore", message="Found unknown categories")
+        X = artifact.transform(raw_df.copy())
+    return DriftReport(
+        psi=population_stability(reference, X),
+        unseen=artifact.preprocessor.unseen_levels(raw_df.copy()),
+        rows=len(raw_df),
+    )
@@ -0,0 +1,253 @@
+"""Memory-compact dtypes from load to estimator.
+
+Raw files are read against a declared schema (RAW_SCHEMA):
+
+- every string column is a pandas category (a small integer code per row
+  instead of a Python string);
+- the establishment year is int16;
+- the numeric columns are float64, or float32 with read_raw_csv(compact=True).
+
+Only Item_Weight and Outlet_Size may be empty. A file with missing
+columns, rows with the wrong number of fields, unparseable numbers or
+empty required values is rejected before any processing. With pyarrow
+installed, files are parsed by its multi-threaded streaming CSV reader in
+blocks, then converted to pandas column by column; chunked reads convert
+one chunk at a time.
+
+With BigMartPreprocessor(compact=True) the feature matrix is compacted as well:
+
+- one-hot blocks become uint8;
+- Outlet_Identifier / Outlet_Age / Non_Consumable become the smallest
+  integer type;
+- numeric features become float32.
+
+Numeric features are still computed in float64 and only stored as
+float32. sklearn trees and XGBoost cast their input to float32 anyway, so
+they see the same values and the estimators get the matrix without
+upcasting. LightGBM compares in double precision, so a few of its
+predictions can move by a split.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+RAW_CATEGORY_COLUMNS = [
+    "Item_Identifier",
+    "Item_Fat_Content",
+    "Item_Type",
+    "Outlet_Identifier",
+    "Outlet_Size",
+    "Outlet_Location_Type",
+    "Outlet_Type",
+]
+RAW_DTYPES = {**{col: "category" for col in RAW_CATEGORY_COLUMNS}, "Outlet_Establishment_Year": "int16"}
+
+# Raw column -> dtype, in file order. Numeric columns are read as float64
+# unless compact: the training path computes its features from float64 values.
+RAW_SCHEMA = {
+    "Item_Identifier": "category",
+    "Item_Weight": "float64",
+    "Item_Fat_Content": "category",
+    "Item_Visibility": "float64",
+    "Item_Type": "category",
+    "Item_MRP": "float64",
+    "Outlet_Identifier": "category",
+    "Outlet_Establishment_Year": "int16",
+    "Outlet_Size": "category",
+    "Outlet_Location_Type": "category",
+    "Outlet_Type": "category",
+    "Item_Outlet_Sales": "float64",
+}
+NULLABLE_COLUMNS = ["Item_Weight", "Outlet_Size"]
+# Absent from the test file
+OPTIONAL_COLUMNS = ["Item_Outlet_Sales"]
+
+# Bytes of CSV the pyarrow reader parses per block
+DEFAULT_BLOCK_SIZE = 64 << 20
+
+
+def raw_schema(compact=False):
+    """RAW_SCHEMA, with float32 numeric columns when compact."""
+    return {col: "float32" if compact and dtype == "float64" else dtype for col, dtype in RAW_SCHEMA.items()}
+
+
+def _header(path):
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _check_columns(path, header, columns):
+    missing = [col for col in (columns or RAW_SCHEMA) if col not in header and col not in OPTIONAL_COLUMNS]
+    if columns is not None:
+        missing += [col for col in columns if col in OPTIONAL_COLUMNS and col not in header]
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}")
+
+
+def _check_nulls(path, df, on_bad_lines):
+    """df without rows that are empty in a required column (raises unless on_bad_lines="skip").
+
+    df's index numbers the data rows of the file, also in later chunks; the
+    kept rows keep it, and an error names the first offending rows by it.
+    """
+    required = [col for col in df.columns if col in RAW_SCHEMA and col not in NULLABLE_COLUMNS]
+    empty = df[required].isna()
+    counts = empty.sum()
+    if not counts.any():
+        return df
+    bad = empty.any(axis=1).to_numpy()
+    if on_bad_lines != "skip":
+        rows = [str(row) for row in df.index[bad][:5]] + (["..."] if bad.sum() > 5 else [])
+        raise ValueError(f"{path}: empty required values {counts[counts > 0].to_dict()} (data rows {', '.join(rows)})")
+    return df[~bad]
+
+
+def _arrow_type(dtype):
+    if dtype == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+def _open_arrow(path, header, schema, columns, on_bad_lines, block_size):
+    """pyarrow's streaming CSV reader over path, converting to the schema's types."""
+    convert_options = pa.csv.ConvertOptions(
+        column_types={col: _arrow_type(dtype) for col, dtype in schema.items() if col in header},
+        include_columns=columns,
+        strings_can_be_null=True,
+    )
+    parse_options = pa.csv.ParseOptions(invalid_row_handler=(lambda row: "skip") if on_bad_lines == "skip" else None)
+    read_options = pa.csv.ReadOptions(block_size=block_size, use_threads=True)
+    try:
+        return pa.csv.open_csv(path, read_options=read_options, parse_options=parse_options,
+                               convert_options=convert_options)
+    except pa.ArrowInvalid as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+
+
+def _arrow_frame(table, start=0):
+    df = table.unify_dictionaries().to_pandas(self_destruct=True, split_blocks=True)
+    del table
+    if start:
+        df.index = pd.RangeIndex(start, start + len(df))
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            # Same category order whatever the row order, like pd.read_csv
+            df[col] = df[col].cat.reorder_categories(df[col].cat.categories.sort_values())
+    return df
+
+
+def _read_arrow(path, header, schema, columns, on_bad_lines, block_size):
+    reader = _open_arrow(path, header, schema, columns, on_bad_lines, block_size)
+    try:
+        with reader:
+            table = reader.read_all()
+    except pa.ArrowInvalid as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    return _arrow_frame(table)
+
+
+def _iter_arrow(path, header, schema, columns, on_bad_lines, block_size, chunksize):
+    """Frames of chunksize rows, re-cut from the record batches as the reader streams them."""
+    reader = _open_arrow(path, header, schema, columns, on_bad_lines, block_size)
+    pending, n_pending, start = [], 0, 0
+    with reader:
+        while True:
+            try:
+                batch = reader.read_next_batch()
+            except StopIteration:
+                break
+            except pa.ArrowInvalid as exc:
+                raise ValueError(f"{path}: {exc}") from exc
+            pending.append(batch)
+            n_pending += batch.num_rows
+            if n_pending < chunksize:
+                continue
+            table = pa.Table.from_batches(pending, schema=reader.schema)
+            for offset in range(0, n_pending - chunksize + 1, chunksize):
+                yield _check_nulls(path, _arrow_frame(table.slice(offset, chunksize), start), on_bad_lines)
+                start += chunksize
+            rest = table.slice(n_pending - n_pending % chunksize)
+            pending, n_pending = rest.to_batches(), rest.num_rows
+    if n_pending:
+        table = pa.Table.from_batches(pending, schema=reader.schema)
+        yield _check_nulls(path, _arrow_frame(table, start), on_bad_lines)
+
+
+def _iter_pandas(path, reader, on_bad_lines):
+    """Validated chunks of a pd.read_csv iterator, with parse errors raised as ValueError naming path."""
+    with reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except (ValueError, pd.errors.ParserError) as exc:
+                raise ValueError(f"{path}: {exc}") from exc
+            yield _check_nulls(path, chunk, on_bad_lines)
+
+
+def read_raw_csv(path, columns=None, compact=False, on_bad_lines="error", engine=None, chunksize=None, **kwargs):
+    """A raw BigMart CSV as a frame with the RAW_SCHEMA dtypes.
+
+    columns reads only those columns. Malformed rows raise ValueError.
+    With on_bad_lines="skip", rows with the wrong number of fields or an
+    empty required value are dropped instead, and the kept rows keep their
+    data row numbers as the index; an unparseable number always raises. engine="pyarrow" (the default when pyarrow is installed) or "c"
+    for pandas' own parser; other pd.read_csv options always use pandas.
+    With chunksize, an iterator of validated frames of that many rows is
+    returned instead, streamed from the file; errors in a later chunk are
+    raised when it is reached, as the same ValueError.
+    """
+    schema = raw_schema(compact)
+    header = _header(path)
+    _check_columns(path, header, columns)
+    engine = engine or ("pyarrow" if pa is not None and not kwargs else "c")
+    if engine == "pyarrow":
+        if chunksize:
+            return _iter_arrow(path, header, schema, columns, on_bad_lines, DEFAULT_BLOCK_SIZE, chunksize)
+        df = _read_arrow(path, header, schema, columns, on_bad_lines, DEFAULT_BLOCK_SIZE)
+        return _check_nulls(path, df, on_bad_lines)
+
+    dtypes = {col: dtype for col, dtype in schema.items() if col in header}
+    try:
+        result = pd.read_csv(path, dtype=dtypes, usecols=columns, on_bad_lines=on_bad_lines, chunksize=chunksize,
+                             **kwargs)
+    except (ValueError, pd.errors.ParserError) as exc:
+        raise ValueError(f"{path}: {exc}") from exc
+    if isinstance(result, pd.DataFrame):
+        return _check_nulls(path, result, on_bad_lines)
+    return _iter_pandas(path, result, on_bad_lines)
+
+
+def compact_raw(df):
+    """Raw frame with its string columns as categories, like read_raw_csv."""
+    dtypes = {col: dtype for col, dtype in RAW_DTYPES.items() if col in df and df[col].dtype != dtype}
+    return df.astype(dtypes) if dtypes else df
+
+
+def compact_features(X):
+    """Feature matrix with bool/one-hot columns as uint8, integers downcast and floats as float32."""
+    columns = {}
+    for col in X.columns:
+        values = X[col]
+        if values.dtype == bool:
+            columns[col] = values.astype(np.uint8)
+        elif values.dtype == np.uint8:
+            columns[col] = values
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            columns[col] = pd.to_numeric(values, downcast="integer")
+        elif values.dtype == np.float64:
+            columns[col] = values.astype(np.float32)
+        else:
+            columns[col] = values
+    return pd.DataFrame(columns, index=X.index)
+
+
+def frame_nbytes(df):
+    """Memory held by a DataFrame, including Python string objects."""
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,285 @@
+"""Render the notebook's EDA figures to image files, headless and in parallel.
+
+    python -m bigmart.eda train_v9rqX0R.csv -o BigMartSales_Visualization_plots
+    python -m bigmart.eda big_train.csv -o eda_plots --n-jobs -1 --max-points 50000
+
+The figures are the nine in BigMartSales_Visualization_plots/, drawn from
+the imputed, cleaned and feature-engineered training data (the notebook's
+df at that point). The frame is written once to a memory-mapped Feather
+file. Each figure is rendered by a worker process with the non-interactive
+Agg backend, so nothing blocks on plt.show().
+
+When the data has more than max_points rows, the figures switch to
+aggregated renderings with the same layout:
+
+- scatter plots become log-scaled hexbin density plots;
+- box plots are drawn from precomputed quartiles and whiskers, with a
+  sample of the outliers;
+- the histogram's KDE is fitted on a sample;
+- the bar chart's confidence interval comes from the standard error
+  instead of seaborn's bootstrap.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.stats import gaussian_kde
+
+from bigmart.pipeline import run_stages, training_stages
+from bigmart.preprocessing import TARGET
+from bigmart.processes import resolve_n_jobs
+from bigmart.stage_cache import DEFAULT_CACHE_DIR, StageCache
+from bigmart.storage import load_frame, save_frame
+
+DEFAULT_MAX_POINTS = 50_000
+EDA_COLUMNS = [
+    TARGET,
+    "Item_Type",
+    "Outlet_Type",
+    "Item_MRP",
+    "Outlet_Age",
+    "Item_Category",
+    "Price_per_Unit_Weight",
+    "Item_Visibility_Log",
+    "Outlet_Age_Category",
+    "Non_Consumable",
+]
+MAX_FLIERS = 500
+KDE_SAMPLE = 20_000
+
+
+def box_stats(values, label, rng=None):
+    """Statistics for Axes.bxp: quartiles, 1.5 IQR whiskers and at most MAX_FLIERS outliers."""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    fliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+    if len(fliers) > MAX_FLIERS:
+        rng = rng or np.random.default_rng(0)
+        # Keep the extremes so the axis range matches the full data
+        sample = rng.choice(fliers, MAX_FLIERS - 2, replace=False)
+        fliers = np.concatenate([[fliers.min(), fliers.max()], sample])
+    return {
+        "label": label,
+        "med": med,
+        "q1": q1,
+        "q3": q3,
+        "whislo": inside.min() if len(inside) else q1,
+        "whishi": inside.max() if len(inside) else q3,
+        "fliers": fliers,
+    }
+
+
+def _boxplot(ax, df, x, y, large, palette=None):
+    import seaborn as sns
+
+    if not large:
+        hue = x if palette else None
+        sns.boxplot(x=x, y=y, data=df, hue=hue, palette=palette, legend=False, ax=ax)
+        return
+    groups = df.groupby(x, observed=True, sort=True)[y]
+    stats = [box_stats(values.to_numpy(), str(key)) for key, values in groups]
+    colors = sns.color_palette(palette, len(stats))
+    boxes = ax.bxp(stats, patch_artist=True, showfliers=True, widths=0.8, medianprops={"color": "0.3"})
+    for patch, color in zip(boxes["boxes"], colors):
+        patch.set_facecolor(color)
+    ax.set_xlabel(x)
+    ax.set_ylabel(y)
+
+
+def _scatter(ax, df, x, y, large):
+    import seaborn as sns
+
+    if not large:
+        sns.scatterplot(x=df[x], y=df[y], alpha=0.5, ax=ax)
+        return
+    hexes = ax.hexbin(df[x], df[y], gridsize=80, bins="log", mincnt=1, cmap="viridis")
+    ax.figure.colorbar(hexes, ax=ax, label="Rows (log scale)")
+
+
+def plot_sales_distribution(df, large, plt):
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    if not large:
+        sns.histplot(df[TARGET], bins=30, kde=True, ax=ax)
+    else:
+        sales = df[TARGET].to_numpy(dtype=float)
+        counts, edges = np.histogram(sales, bins=30)
+        ax.stairs(counts, edges, fill=True, alpha=0.6)
+        sample = np.random.default_rng(0).choice(sales, min(KDE_SAMPLE, len(sales)), replace=False)
+        grid = np.linspace(edges[0], edges[-1], 200)
+        # Density of the sample, scaled to counts like histplot(kde=True)
+        ax.plot(grid, gaussian_kde(sample)(grid) * len(sales) * (edges[1] - edges[0]), color="C0")
+    ax.set_title("Distribution of Sales", fontsize=14)
+    ax.set_xlabel("Item Outlet Sales", fontsize=12)
+    ax.set_ylabel("Frequency", fontsize=12)
+    return fig
+
+
+def plot_sales_by_item_type(df, large, plt):
+    fig, ax = plt.subplots(figsize=(12, 6))
+    _boxplot(ax, df, "Item_Type", TARGET, large)
+    ax.tick_params(axis="x", rotation=90)
+    ax.set_title("Sales by Item Type", fontsize=14)
+    ax.set_xlabel("Item Type", fontsize=12)
+    ax.set_ylabel("Sales", fontsize=12)
+    return fig
+
+
+def plot_sales_by_outlet_type(df, large, plt):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    _boxplot(ax, df, "Outlet_Type", TARGET, large)
+    ax.set_title("Sales by Outlet Type", fontsize=14)
+    ax.set_xlabel("Outlet Type", fontsize=12)
+    ax.set_ylabel("Sales", fontsize=12)
+    return fig
+
+
+def plot_mrp_vs_sales(df, large, plt):
+    fig, ax = plt.subplots(figsize=(10, 5))
+    _scatter(ax, df, "Item_MRP", TARGET, large)
+    ax.set_title("Item MRP vs. Sales", fontsize=14)
+    ax.set_xlabel("Item MRP", fontsize=12)
+    ax.set_ylabel("Sales", fontsize=12)
+    return fig
+
+
+def plot_outlet_age_and_category(df, large, plt):
+    fig, (left, right) = plt.subplots(1, 2, figsize=(14, 6))
+    _boxplot(left, df, "Outlet_Age", TARGET, large, palette="viridis")
+    left.tick_params(axis="x", rotation=45)
+    left.set_title("Outlet Age vs. Sales")
+    left.set_xlabel("Outlet Age (Years)")
+    left.set_ylabel("Item Outlet Sales")
+    _boxplot(right, df, "Item_Category", TARGET, large, palette="Set2")
+    right.set_title("Item Category vs. Sales")
+    right.set_xlabel("Item Category")
+    right.set_ylabel("Item Outlet Sales")
+    fig.tight_layout()
+    return fig
+
+
+def plot_price_per_unit_weight(df, large, plt):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    _scatter(ax, df, "Price_per_Unit_Weight", TARGET, large)
+    ax.set_title("Price per Unit Weight vs. Sales")
+    ax.set_xlabel("Price per Unit Weight")
+    ax.set_ylabel("Item Outlet Sales")
+    return fig
+
+
+def plot_visibility_log(df, large, plt):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    _scatter(ax, df, "Item_Visibility_Log", TARGET, large)
+    ax.set_title("Item Visibility Log vs. Sales")
+    ax.set_xlabel("Log of Item Visibility")
+    ax.set_ylabel("Item Outlet Sales")
+    return fig
+
+
+def plot_outlet_age_category(df, large, plt):
+    fig, ax = plt.subplots(figsize=(8, 5))
+    _boxplot(ax, df, "Outlet_Age_Category", TARGET, large)
+    ax.set_title("Outlet Age Category vs. Sales")
+    ax.set_xlabel("Outlet Age Category")
+    ax.set_ylabel("Item Outlet Sales")
+    return fig
+
+
+def plot_non_consumables(df, large, plt):
+    import seaborn as sns
+
+    fig, ax = plt.subplots(figsize=(8, 5))
+    if not large:
+        sns.barplot(x=df["Non_Consumable"], y=df[TARGET], ax=ax)
+    else:
+        stats = df.groupby("Non_Consumable")[TARGET].agg(["mean", "std", "count"])
+        ci = 1.96 * stats["std"] / np.sqrt(stats["count"])
+        ax.bar(stats.index, stats["mean"], yerr=ci, color=sns.color_palette(n_colors=len(stats)), capsize=0)
+    ax.set_xticks([0, 1], labels=["Consumables", "Non-Consumables"])
+    ax.set_title("Non-Consumables vs. Sales")
+    ax.set_xlabel("Product Type")
+    ax.set_ylabel("Item Outlet Sales")
+    return fig
+
+
+# File names as in BigMartSales_Visualization_plots/
+FIGURES = {
+    "1. Distribution of Item Outlet Sales.png": plot_sales_distribution,
+    "2. Sales by Item Type.png": plot_sales_by_item_type,
+    "3. Sales by Outlet Type.png": plot_sales_by_outlet_type,
+    "4. Item MRP vs. Sales.png": plot_mrp_vs_sales,
+    "5. Outlet Age vs. Sales and Item Category vs. Sales.png": plot_outlet_age_and_category,
+    "6. Price per Unit Weight vs. Sales (Scatter Plot).png": plot_price_per_unit_weight,
+    "7.  Item Visibility Log vs. Sales (Scatter Plot).png": plot_visibility_log,
+    "8. Outlet Age Category vs. Sales (Box Plot).png": plot_outlet_age_category,
+    "9. Non-Consumables vs. Sales (Bar Chart).png": plot_non_consumables,
+}
+
+
+def render_figure(name, frame_path, output_dir, max_points=DEFAULT_MAX_POINTS, dpi=100):
+    """Render one figure from the Feather frame to output_dir/name; returns (path, seconds, aggregated)."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    started = time.perf_counter()
+    sns.set_style("whitegrid")
+    df = load_frame(frame_path)
+    large = len(df) > max_points
+    fig = FIGURES[name](df, large, plt)
+    path = os.path.join(output_dir, name)
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return path, time.perf_counter() - started, large
+
+
+def eda_frame(train_csv, cache=None):
+    """The notebook's df after imputation, cleaning and feature engineering."""
+    _, df = run_stages(training_stages()[:3], train_csv, cache=cache)
+    return df[EDA_COLUMNS]
+
+
+def render_report(df, output_dir, n_jobs=-1, max_points=DEFAULT_MAX_POINTS, names=None):
+    """Render every figure (or those in names) in worker processes; returns [(path, seconds, aggregated)]."""
+    os.makedirs(output_dir, exist_ok=True)
+    names = list(names or FIGURES)
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_path = save_frame(df.reset_index(drop=True), os.path.join(tmp, "eda.feather"))
+        n_jobs = min(resolve_n_jobs(n_jobs), len(names))
+        with ProcessPoolExecutor(n_jobs) as pool:
+            futures = [pool.submit(render_figure, name, frame_path, output_dir, max_points) for name in names]
+            return [future.result() for future in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("train_csv")
+    parser.add_argument("-o", "--output-dir", default="BigMartSales_Visualization_plots")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="worker processes (-1 = all cores)")
+    parser.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS,
+                        help="above this many rows, plot aggregates instead of every point")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage")
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else StageCache(args.cache_dir)
+    df = eda_frame(args.train_csv, cache=cache)
+    print(f"🔄 Rendering {len(FIGURES)} figures from {len(df):,} rows... ⏳")
+    started = time.perf_counter()
+    for path, seconds, aggregated in render_report(df, args.output_dir, n_jobs=args.n_jobs, max_points=args.max_points):
+        print(f"✅ {path} ({seconds:.1f}s{', aggregated' if aggregated else ''})")
+    print(f"📊 Report rendered in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
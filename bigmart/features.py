@@ -0,0 +1,93 @@
+"""Feature engineering shared by the training and scoring paths.
+
+Every derived column is computed column-wise with NumPy, so the cost of
+scoring grows with the number of rows, not with Python calls per row.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+# Item_Identifier prefix -> Item_Category (FD for food, DR for drinks, NC for non-consumables)
+ITEM_CATEGORY_PREFIXES = {"FD": "Food", "DR": "Drinks", "NC": "Non-Consumable"}
+ITEM_CATEGORIES = ["Drinks", "Food", "Non-Consumable"]
+
+# Young (<=15 yrs), Mid (16-25 yrs), Old (26+ yrs), same bins as pd.cut in the notebook
+OUTLET_AGE_BINS = np.array([0, 15, 25, 100])
+OUTLET_AGE_LABELS = ["Young", "Mid", "Old"]
+
+ENGINEERED_COLUMNS = [
+    "Outlet_Age",
+    "Item_Category",
+    "Price_per_Unit_Weight",
+    "Item_Visibility_Log",
+    "Outlet_Age_Category",
+    "Non_Consumable",
+]
+
+
+def item_category_codes(item_identifier):
+    """Codes into ITEM_CATEGORIES for each identifier (-1 for unknown prefixes).
+
+    The prefix lookup runs once per distinct identifier and is gathered back
+    onto the rows, so it costs O(items) string work instead of O(rows).
+    """
+    codes, uniques = pd.factorize(pd.Series(item_identifier))
+    if len(uniques) == 0:
+        return np.full(len(codes), -1, dtype=np.int8)
+    prefixes = pd.Index(uniques).str[:2].map(ITEM_CATEGORY_PREFIXES)
+    unique_codes = pd.Categorical(prefixes, categories=ITEM_CATEGORIES).codes
+    return np.where(codes >= 0, unique_codes[codes], -1).astype(np.int8)
+
+
+def outlet_age_category_codes(outlet_age):
+    """Codes into OUTLET_AGE_LABELS, matching pd.cut(right=True) (-1 outside the bins)."""
+    age = np.asarray(outlet_age, dtype=float)
+    bins = np.searchsorted(OUTLET_AGE_BINS, age, side="left")
+    valid = (bins >= 1) & (bins < len(OUTLET_AGE_BINS))
+    return np.where(valid, bins - 1, -1).astype(np.int8)
+
+
+class BigMartFeatureEngineer(BaseEstimator, TransformerMixin):
+    """Adds the engineered BigMart features to a raw (imputed) frame.
+
+    Creates Outlet_Age, Item_Category, Price_per_Unit_Weight,
+    Item_Visibility_Log, Outlet_Age_Category and Non_Consumable. The same
+    fitted object is used for the training frame and for scoring, so both
+    paths always produce identical features.
+    """
+
+    def __init__(self, current_year=2025):
+        self.current_year = current_year
+
+    def fit(self, X, y=None):
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "feature_names_in_")
+        df = X.copy()
+
+        outlet_age = self.current_year - df["Outlet_Establishment_Year"].to_numpy()
+        df["Outlet_Age"] = outlet_age
+
+        category_codes = item_category_codes(df["Item_Identifier"])
+        df["Item_Category"] = pd.Categorical.from_codes(category_codes, categories=ITEM_CATEGORIES)
+
+        df["Price_per_Unit_Weight"] = df["Item_MRP"].to_numpy() / df["Item_Weight"].to_numpy()
+        df["Item_Visibility_Log"] = np.log1p(df["Item_Visibility"].to_numpy())
+
+        df["Outlet_Age_Category"] = pd.Categorical.from_codes(
+            outlet_age_category_codes(outlet_age), categories=OUTLET_AGE_LABELS
+        )
+        df["Non_Consumable"] = (
+            category_codes == ITEM_CATEGORIES.index("Non-Consumable")
+        ).astype(np.int64)
+        return df
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "feature_names_in_")
+        names = [c for c in self.feature_names_in_ if c not in ENGINEERED_COLUMNS]
+        return np.asarray(names + ENGINEERED_COLUMNS, dtype=object)
@@ -0,0 +1,317 @@
+"""Tree ensembles flattened into NumPy arrays, with a vectorized evaluator.
+
+flatten_model turns a fitted LightGBM, XGBoost or Gradient Boosting
+regressor into a FlatTreeEnsemble. Every node of every tree becomes one
+slot in a few contiguous arrays:
+
+- feature index and threshold;
+- left/right child;
+- leaf value;
+- default direction and missing-value rule.
+
+Leaves point to themselves, so evaluation needs no branch per node. All rows
+go through all trees together, one level per step: gather each (row, tree)
+pair's node feature, compare it with the node threshold and move to a child.
+After max_depth steps every pair sits on its leaf. The leaf values are
+then added tree by tree, in the order and precision of the native predict.
+
+Splits follow each library's own rule, so predictions match native predict
+exactly:
+
+- sklearn and XGBoost compare float32 inputs;
+- LightGBM compares float64 inputs;
+- XGBoost's strict `x < t` is stored as `x <= t'`, where t' is the next
+  float32 below t;
+- missing values go the way each library sends them;
+- XGBoost sums in float32, LightGBM and sklearn in float64.
+
+flatten_artifact swaps the model of an artifact for its flattened form
+(see bigmart.flatten). The result scores with numpy/pandas/sklearn only:
+lightgbm and xgboost are not needed to load it.
+"""
+
+import copy
+import json
+import time
+
+import numpy as np
+
+# missing_type codes: NaN read as 0.0 / zero or NaN take the default branch / NaN takes it
+MISSING_NONE, MISSING_ZERO, MISSING_NAN = 0, 1, 2
+# LightGBM treats |x| <= kZeroThreshold as zero
+ZERO_THRESHOLD = 1e-35
+# (row, tree) pairs walked per block, bounding the evaluator's scratch memory
+DEFAULT_BLOCK_PAIRS = 1 << 16
+
+
+class FlatTreeEnsemble:
+    """A boosted tree ensemble as flat node arrays: base_score + one leaf value per tree.
+
+    Leaf values are added tree by tree in sum_dtype, starting from
+    base_score, in the same order and precision as the native predict.
+    """
+
+    def __init__(self, feature, threshold, children, value, default_left, missing_type, roots, max_depth,
+                 base_score, dtype, sum_dtype=np.float64, source=""):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        # children[2 * node] is the left child, children[2 * node + 1] the right one
+        self.children = np.ascontiguousarray(children, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.missing_type = np.ascontiguousarray(missing_type, dtype=np.int8)
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.base_score = float(base_score)
+        self.dtype = np.dtype(dtype)
+        self.sum_dtype = np.dtype(sum_dtype)
+        self.source = source
+        self._compile()
+
+    def _compile(self):
+        """Lookup tables indexed by slot = 2 * node, so a step is slot -> 2 * children[slot + go_right]."""
+        self._slot_feature = np.repeat(self.feature, 2).astype(np.intp)
+        self._slot_threshold = np.repeat(self.threshold, 2)
+        self._slot_children = 2 * self.children.astype(np.intp)
+        self._slot_value = np.repeat(self.value, 2).astype(self.sum_dtype)
+        self._slot_roots = 2 * self.roots.astype(np.intp)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if not k.startswith("_slot")}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compile()
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _missing_step(self, x, slot):
+        """go_right for one level when some inputs are NaN, following each node's missing rule."""
+        node = slot >> 1
+        nan = np.isnan(x)
+        missing_type = self.missing_type[node]
+        x = np.where(nan & (missing_type == MISSING_NONE), 0.0, x)
+        missing = (nan & (missing_type == MISSING_NAN)) | (
+            (nan | (np.abs(x) <= ZERO_THRESHOLD)) & (missing_type == MISSING_ZERO)
+        )
+        return np.where(missing, ~self.default_left[node], x > self.threshold[node])
+
+    def leaf_slots(self, X):
+        """Leaf slot (2 * node) of every (row, tree) pair, shape (n_rows, n_trees)."""
+        n_rows, n_features = X.shape
+        flat_x = X.ravel()
+        shape = (n_rows, self.n_trees)
+        slot = np.broadcast_to(self._slot_roots, shape).copy()
+        index = np.empty(shape, dtype=np.intp)
+        x = np.empty(shape, dtype=X.dtype)
+        threshold = np.empty(shape, dtype=np.float64)
+        go_right = np.empty(shape, dtype=bool)
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        has_missing = np.isnan(flat_x).any()
+        for _ in range(self.max_depth):
+            np.take(self._slot_feature, slot, out=index)
+            index += row_offset
+            np.take(flat_x, index, out=x)
+            if has_missing:
+                go_right = self._missing_step(x, slot)
+            else:
+                np.take(self._slot_threshold, slot, out=threshold)
+                np.greater(x, threshold, out=go_right)
+            slot += go_right
+            np.take(self._slot_children, slot, out=slot)
+        return slot
+
+    def predict(self, X, block_pairs=DEFAULT_BLOCK_PAIRS):
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        out = np.empty(len(X), dtype=self.sum_dtype)
+        block = max(1, block_pairs // max(1, self.n_trees))
+        for start in range(0, len(X), block):
+            values = np.take(self._slot_value, self.leaf_slots(X[start:start + block]).T)
+            total = np.full(values.shape[1], self.base_score, dtype=self.sum_dtype)
+            for tree_values in values:
+                total += tree_values
+            out[start:start + block] = total
+        return out
+
+
+class _Builder:
+    """Accumulates nodes tree by tree into the flat arrays."""
+
+    def __init__(self):
+        self.feature, self.threshold, self.left, self.right = [], [], [], []
+        self.value, self.default_left, self.missing_type = [], [], []
+        self.roots, self.max_depth = [], 0
+
+    def add_tree(self, feature, threshold, left, right, value, default_left, missing_type):
+        """Add one tree given per-node arrays with local child indices (-1 at leaves)."""
+        offset = sum(len(f) for f in self.feature)
+        left, right = np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64)
+        leaf = left < 0
+        own = np.arange(len(left)) + offset
+        self.feature.append(np.where(leaf, 0, feature))
+        self.threshold.append(np.where(leaf, 0.0, threshold))
+        self.left.append(np.where(leaf, own, left + offset))
+        self.right.append(np.where(leaf, own, right + offset))
+        self.value.append(np.where(leaf, value, 0.0))
+        self.default_left.append(np.asarray(default_left, dtype=bool))
+        self.missing_type.append(np.asarray(missing_type, dtype=np.int8))
+        self.roots.append(offset)
+        self.max_depth = max(self.max_depth, _depth(left, right))
+
+    def build(self, base_score, dtype, sum_dtype, source):
+        children = np.empty(2 * sum(len(f) for f in self.feature), dtype=np.int32)
+        children[0::2] = np.concatenate(self.left)
+        children[1::2] = np.concatenate(self.right)
+        return FlatTreeEnsemble(
+            feature=np.concatenate(self.feature),
+            threshold=np.concatenate(self.threshold),
+            children=children,
+            value=np.concatenate(self.value),
+            default_left=np.concatenate(self.default_left),
+            missing_type=np.concatenate(self.missing_type),
+            roots=self.roots,
+            max_depth=self.max_depth,
+            base_score=base_score,
+            dtype=dtype,
+            sum_dtype=sum_dtype,
+            source=source,
+        )
+
+
+def _depth(left, right):
+    """Longest root-to-leaf path of a tree given local child indices."""
+    depth = np.zeros(len(left), dtype=np.int64)
+    level, deepest = [0], 0
+    while level:
+        children = []
+        for node in level:
+            if left[node] >= 0:
+                depth[left[node]] = depth[right[node]] = depth[node] + 1
+                deepest = max(deepest, depth[node] + 1)
+                children += [left[node], right[node]]
+        level = children
+    return deepest
+
+
+def _flatten_sklearn(model):
+    builder = _Builder()
+    for tree in model.estimators_[:, 0]:
+        t = tree.tree_
+        missing_left = getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=bool))
+        builder.add_tree(
+            t.feature, t.threshold, t.children_left, t.children_right,
+            model.learning_rate * t.value[:, 0, 0],
+            missing_left, np.full(t.node_count, MISSING_NAN),
+        )
+    init = model.init_
+    if init == "zero":
+        base_score = 0.0
+    elif hasattr(init, "constant_"):
+        base_score = float(np.ravel(init.constant_)[0])
+    else:
+        raise TypeError(f"cannot flatten a Gradient Boosting model with init={type(init).__name__}")
+    return builder.build(base_score, np.float32, np.float64, type(model).__name__)
+
+
+def _flatten_lightgbm(booster):
+    dump = booster.dump_model()
+    if dump.get("average_output"):
+        raise TypeError("cannot flatten an averaged (random forest) LightGBM model")
+    missing_codes = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+    builder = _Builder()
+    for info in dump["tree_info"]:
+        nodes = []
+
+        def visit(node):
+            index = len(nodes)
+            nodes.append(None)
+            if "leaf_value" in node or "split_feature" not in node:
+                nodes[index] = (-1, 0.0, -1, -1, node.get("leaf_value", 0.0), False, MISSING_NONE)
+                return index
+            if node["decision_type"] != "<=":
+                raise TypeError(f"cannot flatten LightGBM {node['decision_type']} (categorical) splits")
+            left = visit(node["left_child"])
+            right = visit(node["right_child"])
+            nodes[index] = (node["split_feature"], node["threshold"], left, right, 0.0,
+                            node["default_left"], missing_codes[node["missing_type"]])
+            return index
+
+        visit(info["tree_structure"])
+        builder.add_tree(*map(list, zip(*nodes)))
+    return builder.build(0.0, np.float64, np.float64, "LGBMRegressor")
+
+
+def _flatten_xgboost(booster):
+    model = json.loads(booster.save_raw("json"))
+    learner = model["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror"):
+        raise TypeError(f"cannot flatten an XGBoost model with objective {objective}")
+    gbm = learner["gradient_booster"]
+    if gbm["name"] != "gbtree":
+        raise TypeError(f"cannot flatten an XGBoost {gbm['name']} model")
+    builder = _Builder()
+    for tree in gbm["model"]["trees"]:
+        left = np.asarray(tree["left_children"])
+        split = np.asarray(tree["split_conditions"], dtype=np.float32)
+        # x < t on float32 inputs is x <= the next float32 below t
+        threshold = np.nextafter(split, np.float32(-np.inf)).astype(np.float64)
+        builder.add_tree(
+            tree["split_indices"], threshold, left, tree["right_children"], split.astype(np.float64),
+            np.asarray(tree["default_left"], dtype=bool), np.full(len(left), MISSING_NAN),
+        )
+    base_score = float(str(learner["learner_model_param"]["base_score"]).strip("[]"))
+    return builder.build(base_score, np.float32, np.float32, "XGBRegressor")
+
+
+def flatten_model(model):
+    """FlatTreeEnsemble equivalent to a fitted LightGBM, XGBoost or Gradient Boosting regressor."""
+    if isinstance(model, FlatTreeEnsemble):
+        return model
+    if hasattr(model, "booster_"):
+        return _flatten_lightgbm(model.booster_)
+    if hasattr(model, "get_booster"):
+        return _flatten_xgboost(model.get_booster())
+    if hasattr(model, "estimators_") and hasattr(model, "init_"):
+        return _flatten_sklearn(model)
+    raise TypeError(f"cannot flatten {type(model).__name__}; expected a boosted tree ensemble")
+
+
+def flatten_artifact(artifact):
+    """Copy of a ModelArtifact whose model is its FlatTreeEnsemble."""
+    flat = copy.copy(artifact)
+    flat.model = flatten_model(artifact.model)
+    flat.metadata = {**artifact.metadata, "flattened_from": type(artifact.model).__name__}
+    return flat
+
+
+def _best_time(fn, repeat):
+    best = np.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def benchmark_flat(artifact, raw_df, repeat=3):
+    """Native vs flattened predict on the feature matrix of raw_df: seconds and max abs difference."""
+    X = artifact.dimensions.transform(raw_df)
+    flat = flatten_artifact(artifact)
+    native, native_seconds = _best_time(lambda: artifact.predict_matrix(X), repeat)
+    flattened, flat_seconds = _best_time(lambda: flat.predict_matrix(X), repeat)
+    return {
+        "rows": len(X),
+        "trees": flat.model.n_trees,
+        "nodes": flat.model.n_nodes,
+        "max_depth": flat.model.max_depth,
+        "native_seconds": native_seconds,
+        "flat_seconds": flat_seconds,
+        "max_abs_diff": float(np.max(np.abs(native - flattened))) if len(X) else 0.0,
+    }
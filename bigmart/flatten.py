@@ -0,0 +1,47 @@
+"""Export a saved model as flat tree arrays (see bigmart.flat_trees).
+
+    python -m bigmart.flatten bigmart_model.joblib -o bigmart_model_flat.joblib
+    python -m bigmart.flatten bigmart_model.joblib -o bigmart_model_flat.joblib --benchmark test_AbJTz2l.csv
+
+The output artifact scores with the vectorized NumPy evaluator, so loading
+it needs neither lightgbm nor xgboost. --benchmark times native and
+flattened predict on the given raw rows and reports the largest
+difference between them.
+"""
+
+import argparse
+import sys
+
+from bigmart.artifact import load_artifact, save_artifact
+from bigmart.dtypes import read_raw_csv
+from bigmart.flat_trees import benchmark_flat, flatten_artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact")
+    parser.add_argument("-o", "--output", default="bigmart_model_flat.joblib")
+    parser.add_argument("--benchmark", default=None, metavar="CSV", help="compare with native predict on these raw rows")
+    parser.add_argument("--repeat", type=int, default=3, help="benchmark runs; the fastest is kept")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.artifact)
+    try:
+        flat = flatten_artifact(artifact)
+    except TypeError as exc:
+        print(f"❌ {exc}")
+        return 1
+    print(f"✅ Flattened {artifact.model_name or type(artifact.model).__name__}: {flat.model.n_trees} trees, "
+          f"{flat.model.n_nodes:,} nodes, depth {flat.model.max_depth}")
+    save_artifact(flat, args.output)
+    print(f"✅ Flattened artifact saved to {args.output}")
+
+    if args.benchmark:
+        result = benchmark_flat(artifact, read_raw_csv(args.benchmark), repeat=args.repeat)
+        print(f"📊 {result['rows']:,} rows - native {result['native_seconds']:.3f}s, "
+              f"flattened {result['flat_seconds']:.3f}s, max |difference| {result['max_abs_diff']:.2e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Per-fold training sets built once and shared by every search trial.
+
+LGBMRegressor.fit and XGBRegressor.fit bin and quantize their input on
+every call, so a search with C candidates and K folds bins the same fold
+rows C * K times. FoldCache builds each fold's binned training set once:
+
+- a constructed lightgbm.Dataset;
+- an xgboost.QuantileDMatrix;
+- for the sklearn estimators, C-contiguous float32 arrays (the dtype their
+  trees use), so check_array does not copy.
+
+Trials then train on these with lightgbm.train / xgboost.train. The
+booster parameters are taken from the sklearn wrapper built by
+make_model, so a trial fits the same model that wrapper would.
+
+With a row budget (successive halving's n_samples resource), each
+(fold, budget) subsample is also built once. Parameters that change the
+binning itself (LightGBM's min_child_samples, which drives its feature
+pre-filter, and max_bin) are part of the cache key, so trials that differ
+in them get their own set rather than a mismatched one.
+"""
+
+import numpy as np
+
+from bigmart import profiling
+from bigmart.models import make_model
+
+
+def _lightgbm_params(model):
+    params = model.get_params()
+    for name in ("n_estimators", "importance_type", "class_weight"):
+        params.pop(name, None)
+    params = {k: v for k, v in params.items() if v is not None}
+    params["objective"] = params.get("objective") or "regression"
+    return params
+
+
+def _xgboost_params(model):
+    return {k: v for k, v in model.get_xgb_params().items() if v is not None}
+
+
+def _dataset_params(backend, model):
+    """The parameters a binned training set depends on."""
+    if backend == "lightgbm":
+        params = _lightgbm_params(model)
+        return {k: params[k] for k in ("verbose", "subsample_for_bin", "min_child_samples", "max_bin") if k in params}
+    if backend == "xgboost":
+        return {"max_bin": _xgboost_params(model).get("max_bin", 256)}
+    return {}
+
+
+def _backend(model_name):
+    if model_name == "LightGBM":
+        return "lightgbm"
+    if model_name == "XGBoost":
+        return "xgboost"
+    return "sklearn"
+
+
+class FoldCache:
+    """Training sets for (fold, row budget) pairs of one model family, built on first use."""
+
+    def __init__(self, model_name, X, y, folds, random_state=42):
+        self.model_name = model_name
+        self.backend = _backend(model_name)
+        self.X = np.ascontiguousarray(X, dtype=np.float32 if self.backend != "lightgbm" else np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.folds = folds
+        self.random_state = random_state
+        self._train_sets = {}
+        self.builds = 0
+
+    def train_rows(self, fold, n_samples=None):
+        train_idx = self.folds[fold][0]
+        if n_samples is not None and n_samples < len(train_idx):
+            rng = np.random.default_rng(self.random_state)
+            train_idx = rng.choice(train_idx, size=int(n_samples), replace=False)
+        return train_idx
+
+    def train_set(self, fold, n_samples=None, dataset_params=None):
+        dataset_params = dataset_params or {}
+        key = (fold, n_samples, tuple(sorted(dataset_params.items())))
+        if key not in self._train_sets:
+            rows = self.train_rows(fold, n_samples)
+            with profiling.span("fold_cache.build", rows=len(rows), model=self.model_name, fold=fold):
+                self._train_sets[key] = self._build(self.X[rows], self.y[rows], dataset_params)
+            self.builds += 1
+        return self._train_sets[key]
+
+    def _build(self, X, y, dataset_params):
+        if self.backend == "lightgbm":
+            import lightgbm as lgb
+
+            return lgb.Dataset(X, y, params=dataset_params, free_raw_data=True).construct()
+        if self.backend == "xgboost":
+            import xgboost as xgb
+
+            return xgb.QuantileDMatrix(X, y, **dataset_params)
+        return X, y
+
+    def fit_predict(self, params, fold, n_estimators=None, n_samples=None, tree_counts=None):
+        """Fit a trial on a fold's training set and predict its test rows.
+
+        Returns the predictions, or {n_trees: predictions} for every count in
+        tree_counts (fitting once at the largest).
+        """
+        if tree_counts is not None:
+            n_estimators = max(tree_counts)
+        model = make_model(self.model_name, **params, **({"n_estimators": n_estimators} if n_estimators else {}))
+        train_set = self.train_set(fold, n_samples, _dataset_params(self.backend, model))
+        X_test = self.X[self.folds[fold][1]]
+        n_train = len(self.folds[fold][0]) if n_samples is None else min(int(n_samples), len(self.folds[fold][0]))
+        with profiling.span("model.fit", rows=n_train, model=self.model_name, fold=fold):
+            fitted = self._fit(model, train_set)
+        with profiling.span("model.predict", rows=len(X_test), model=self.model_name, fold=fold):
+            return self._predict(model, fitted, X_test, tree_counts)
+
+    def _fit(self, model, train_set):
+        """A booster trained on train_set (LightGBM / XGBoost), or the fitted sklearn model."""
+        if self.backend == "lightgbm":
+            import lightgbm as lgb
+
+            return lgb.train(_lightgbm_params(model), train_set, num_boost_round=model.n_estimators)
+        if self.backend == "xgboost":
+            import xgboost as xgb
+
+            return xgb.train(_xgboost_params(model), train_set, num_boost_round=model.n_estimators)
+        return model.fit(*train_set)
+
+    def _predict(self, model, fitted, X_test, tree_counts):
+        if self.backend == "lightgbm":
+            def predict(n):
+                return fitted.predict(X_test, num_iteration=n)
+        elif self.backend == "xgboost":
+            def predict(n):
+                return fitted.inplace_predict(X_test, iteration_range=(0, n or model.n_estimators))
+        else:
+            if tree_counts is not None:
+                wanted = set(tree_counts)
+                return {i: p for i, p in enumerate(fitted.staged_predict(X_test), start=1) if i in wanted}
+
+            def predict(n):
+                return fitted.predict(X_test)
+
+        if tree_counts is not None:
+            return {n: predict(n) for n in sorted(set(tree_counts))}
+        return predict(None)
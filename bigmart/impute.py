@@ -0,0 +1,144 @@
+"""Group-wise imputation with fitted lookup tables.
+
+Group means use the built-in (Cython) groupby mean and group modes use
+pd.factorize + np.bincount, rather than a Python lambda per group, so
+fitting stays linear in rows however many Item_Identifier groups there are.
+The fitted tables are applied to train and test rows alike with a
+vectorized index lookup. The group counts are kept alongside, so
+partial_fit can fold new rows into the tables without the old ones.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+
+def group_means(keys, values):
+    """Mean of values per key, ignoring NaN; groups without any value are left out."""
+    values = pd.Series(np.asarray(values, dtype=float))
+    means = values.groupby(np.asarray(keys), sort=False).mean().dropna()
+    means.index.name = None
+    return means
+
+
+def group_counts(keys, values):
+    """Number of non-missing values per key."""
+    counts = pd.Series(np.asarray(values)).notna().groupby(np.asarray(keys), sort=False).sum()
+    counts.index.name = None
+    return counts[counts > 0].astype(np.int64)
+
+
+def group_value_counts(keys, values):
+    """Occurrences of every value per key, as a (key x sorted value) frame."""
+    key_codes, key_uniques = pd.factorize(pd.Series(keys))
+    value_codes, value_uniques = pd.factorize(pd.Series(values), sort=True)
+    valid = (key_codes >= 0) & (value_codes >= 0)
+    n_values = max(len(value_uniques), 1)
+    counts = np.bincount(
+        key_codes[valid] * n_values + value_codes[valid], minlength=len(key_uniques) * n_values
+    ).reshape(len(key_uniques), n_values)
+    return pd.DataFrame(
+        counts[:, : len(value_uniques)],
+        index=pd.Index(np.asarray(key_uniques, dtype=object)),
+        columns=pd.Index(np.asarray(value_uniques, dtype=object)),
+    )
+
+
+def modes_from_counts(counts):
+    """Most frequent value per row of a group_value_counts frame, ties going to the smallest value."""
+    counts = counts[counts.sum(axis=1) > 0]
+    modes = np.asarray(counts.columns)[counts.to_numpy().argmax(axis=1)] if counts.shape[1] else []
+    return pd.Series(modes, index=counts.index, dtype=object)
+
+
+def group_modes(keys, values):
+    """Most frequent value per key, ties going to the smallest value like Series.mode()[0]."""
+    return modes_from_counts(group_value_counts(keys, values))
+
+
+def lookup(table, keys):
+    """Gather table values for keys (NaN where the key was not seen at fit time)."""
+    positions = table.index.get_indexer(pd.Series(keys))
+    values = np.asarray(table, dtype=object if table.dtype == object else float)
+    gathered = values.take(positions, mode="clip") if len(values) else np.full(len(positions), np.nan)
+    return np.where(positions >= 0, gathered, np.nan)
+
+
+class GroupImputer(BaseEstimator, TransformerMixin):
+    """Fills missing values from per-group means and modes.
+
+    Defaults follow the notebook: Item_Weight from the mean weight of the same
+    Item_Identifier (falling back to the overall mean), Outlet_Size from the
+    most frequent size of the same Outlet_Type.
+
+    Fitted tables: means_[column] and modes_[column] are Series indexed by
+    group key; fallbacks_[column] is the overall mean used for unseen groups.
+    counts_, fallback_counts_ and value_counts_ hold the row counts behind
+    them for partial_fit.
+    """
+
+    def __init__(self, mean_by=(("Item_Weight", "Item_Identifier"),), mode_by=(("Outlet_Size", "Outlet_Type"),)):
+        self.mean_by = mean_by
+        self.mode_by = mode_by
+
+    def fit(self, X, y=None):
+        self.means_, self.fallbacks_, self.modes_ = {}, {}, {}
+        self.counts_, self.fallback_counts_, self.value_counts_ = {}, {}, {}
+        for column, group in self.mean_by:
+            self.means_[column] = group_means(X[group], X[column])
+            self.counts_[column] = group_counts(X[group], X[column])
+            # Overall mean of the group-filled column, as in the notebook
+            filled = X[column].fillna(pd.Series(lookup(self.means_[column], X[group]), index=X.index))
+            self.fallbacks_[column] = float(filled.mean())
+            self.fallback_counts_[column] = int(filled.count())
+        for column, group in self.mode_by:
+            self.value_counts_[column] = group_value_counts(X[group], X[column])
+            self.modes_[column] = modes_from_counts(self.value_counts_[column])
+        return self
+
+    def partial_fit(self, X, y=None):
+        """Fold new rows into the fitted tables.
+
+        Group means and modes come out as if fit had seen the old and new rows
+        together. The overall fallback mean is updated as a running mean over
+        the rows it could fill.
+        """
+        if not hasattr(self, "means_"):
+            return self.fit(X)
+        for column, group in self.mean_by:
+            old_counts = self.counts_[column]
+            new_counts = group_counts(X[group], X[column])
+            new_sums = pd.Series(np.asarray(X[column], dtype=float)).groupby(np.asarray(X[group]), sort=False).sum()
+            counts = old_counts.add(new_counts, fill_value=0)
+            sums = (self.means_[column] * old_counts).add(new_sums.reindex(new_counts.index), fill_value=0)
+            self.means_[column] = (sums[counts.index] / counts).astype(float)
+            self.counts_[column] = counts.astype(np.int64)
+
+            filled = X[column].fillna(pd.Series(lookup(self.means_[column], X[group]), index=X.index))
+            n_old, n_new = self.fallback_counts_[column], int(filled.count())
+            if n_new:
+                self.fallbacks_[column] = (self.fallbacks_[column] * n_old + float(filled.sum())) / (n_old + n_new)
+                self.fallback_counts_[column] = n_old + n_new
+        for column, group in self.mode_by:
+            counts = self.value_counts_[column].add(group_value_counts(X[group], X[column]), fill_value=0)
+            counts = counts.reindex(columns=sorted(counts.columns)).fillna(0).astype(np.int64)
+            self.value_counts_[column] = counts
+            self.modes_[column] = modes_from_counts(counts)
+        return self
+
+    def transform(self, X):
+        check_is_fitted(self, "means_")
+        df = X.copy()
+        for column, group in self.mean_by:
+            means = pd.Series(lookup(self.means_[column], df[group]), index=df.index, dtype=float)
+            df[column] = df[column].fillna(means).fillna(self.fallbacks_[column])
+        for column, group in self.mode_by:
+            modes = pd.Series(lookup(self.modes_[column], df[group]), index=df.index)
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # A categorical column can only be filled with one of its categories
+                new = sorted(set(self.modes_[column]) - set(values.cat.categories))
+                values = values.cat.add_categories(new) if new else values
+            df[column] = values.fillna(modes)
+        return df
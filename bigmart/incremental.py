@@ -0,0 +1,125 @@
+"""Incremental model updates on new sales periods.
+
+update_artifact takes a trained ModelArtifact and a batch of new labelled
+raw rows:
+
+1. Drift: the batch is compared with the training features (see
+   bigmart.drift). If any numeric input drifts beyond max_psi, or the batch
+   has categories the encoders have never seen, the model is rebuilt from
+   scratch on history + batch. A stacked ensemble (bigmart.stacking) is
+   always rebuilt, with the base models and folds it was trained with.
+2. Otherwise the preprocessor's imputation tables and item/outlet tables
+   are updated with the batch (BigMartPreprocessor.partial_fit): new
+   identifiers are added and known ones take the batch's attributes. The
+   scaling and encoding stay fixed, so the existing trees still apply.
+3. The model continues boosting from its current state on the batch:
+   update_trees more trees, with LightGBM's init_model, XGBoost's xgb_model
+   or Gradient Boosting's warm_start.
+
+The result is a new artifact; the input artifact is left untouched. Its
+metadata["updates"] lists every update and rebuild, across rebuilds.
+"""
+
+import copy
+import time
+
+import pandas as pd
+from sklearn.base import clone
+
+from bigmart.artifact import ModelArtifact
+from bigmart.drift import DEFAULT_MAX_PSI, measure_drift
+from bigmart.dtypes import read_raw_csv
+from bigmart.metrics import rmse
+from bigmart.pipeline import train_artifact
+from bigmart.preprocessing import TARGET
+from bigmart.stacking import STACKED_MODEL_NAME, train_stacked_artifact
+
+DEFAULT_UPDATE_TREES = 50
+
+
+def continue_training(model, X, y, n_estimators=DEFAULT_UPDATE_TREES):
+    """A copy of a fitted boosted model with n_estimators more trees fitted on (X, y)."""
+    if hasattr(model, "booster_"):
+        # LightGBM
+        updated = clone(model).set_params(n_estimators=n_estimators)
+        return updated.fit(X, y, init_model=model.booster_)
+    if hasattr(model, "get_booster"):
+        # XGBoost
+        updated = clone(model).set_params(n_estimators=n_estimators)
+        return updated.fit(X, y, xgb_model=model.get_booster())
+    if hasattr(model, "staged_predict"):
+        # GradientBoostingRegressor: warm_start adds stages fitted to the residuals on (X, y)
+        updated = copy.deepcopy(model).set_params(warm_start=True, n_estimators=model.n_estimators_ + n_estimators)
+        return updated.fit(X, y)
+    raise TypeError(f"{type(model).__name__} cannot continue training; rebuild it instead")
+
+
+def rebuild_artifact(artifact, raw_df, cache=None):
+    """A new artifact of the same kind as artifact (model and parameters), trained from scratch on raw_df."""
+    params = artifact.metadata.get("model_params") or {}
+    if artifact.model_name == STACKED_MODEL_NAME:
+        rebuilt, _ = train_stacked_artifact(
+            raw_df, names=params["base_models"], model_params=params.get("params"), cv=params["cv"], cache=cache
+        )
+        return rebuilt
+    return train_artifact(
+        raw_df, model_name=artifact.model_name, model_params=params, compact=artifact.preprocessor.compact, cache=cache
+    )
+
+
+def update_artifact(
+    artifact,
+    new_df,
+    history=None,
+    update_trees=DEFAULT_UPDATE_TREES,
+    max_psi=DEFAULT_MAX_PSI,
+    force_rebuild=False,
+    cache=None,
+):
+    """(new artifact, DriftReport, "updated" | "rebuilt") for a batch of labelled raw rows.
+
+    history is the raw training data (DataFrame or CSV path) used when a
+    rebuild is needed. Without it, a drifting batch raises ValueError.
+    """
+    report = measure_drift(artifact, new_df)
+    y_new = new_df[TARGET].to_numpy(dtype=float)
+    rmse_before = rmse(y_new, artifact.predict(new_df.copy()))
+
+    stacked = artifact.model_name == STACKED_MODEL_NAME
+    if force_rebuild or stacked or report.exceeds(max_psi):
+        if history is None:
+            if stacked:
+                raise ValueError("a stacked ensemble cannot continue training; its rebuild needs the training history")
+            raise ValueError(
+                f"batch drifted (max PSI {report.max_psi:.3f}, unseen levels {report.unseen}); "
+                "a full rebuild needs the training history"
+            )
+        if not isinstance(history, pd.DataFrame):
+            history = read_raw_csv(history)
+        rebuilt = rebuild_artifact(artifact, pd.concat([history, new_df], ignore_index=True), cache=cache)
+        # Keep the artifact's update history; the rebuild is its latest entry
+        rebuilt.metadata["updates"] = copy.deepcopy(artifact.metadata.get("updates", [])) + [{
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "rows": len(new_df),
+            "rebuilt": True,
+            "max_psi": report.max_psi,
+            "rmse_before_update": rmse_before,
+        }]
+        return rebuilt, report, "rebuilt"
+
+    preprocessor = copy.deepcopy(artifact.preprocessor).partial_fit(new_df.copy())
+    X_new = preprocessor.transform(new_df.copy())
+    model = continue_training(artifact.model, X_new, y_new, n_estimators=update_trees)
+
+    metadata = copy.deepcopy(artifact.metadata)
+    metadata.pop("saved_at", None)
+    metadata.setdefault("updates", []).append({
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "rows": len(new_df),
+        "trees_added": update_trees,
+        "max_psi": report.max_psi,
+        # Error of the previous model on this batch, before it was trained on it
+        "rmse_before_update": rmse_before,
+    })
+    updated = ModelArtifact(model=model, preprocessor=preprocessor, model_name=artifact.model_name, metadata=metadata)
+    return updated, report, "updated"
@@ -0,0 +1,128 @@
+"""Precompiled feature layout: raw records straight into a NumPy matrix.
+
+Built once from a fitted BigMartPreprocessor, a FeatureLayout knows the
+slot of every output column, the one-hot slot of every category level, the
+Outlet_Identifier label codes, the imputation tables and the scaling
+constants. Scoring a record is then a handful of dict lookups and slot
+writes into a preallocated array, with no DataFrames built per request.
+
+The output matches BigMartPreprocessor.transform column for column.
+"""
+
+import math
+
+import numpy as np
+
+from bigmart.features import ITEM_CATEGORY_PREFIXES, OUTLET_AGE_BINS, OUTLET_AGE_LABELS
+from bigmart.preprocessing import DUMMY_COLUMNS, FAT_CONTENT_MAP, ITEM_TYPE_COLUMN, NUM_COLS
+
+# One-hot groups, in the order FeatureLayout.fill resolves their levels
+ONEHOT_GROUPS = DUMMY_COLUMNS + ITEM_TYPE_COLUMN
+
+
+def _missing(value):
+    return value is None or value != value
+
+
+def _age_label(age):
+    for low, high, label in zip(OUTLET_AGE_BINS[:-1], OUTLET_AGE_BINS[1:], OUTLET_AGE_LABELS):
+        if low < age <= high:
+            return label
+    return None
+
+
+class FeatureLayout:
+    """Maps raw BigMart records into slots of a preallocated feature matrix.
+
+    dtype defaults to float64 because the models are fit on float64 features:
+    rounding inputs to float32 can move values across split thresholds.
+    Pass dtype=np.float32 for models trained on float32 data.
+    """
+
+    def __init__(self, preprocessor, dtype=np.float64):
+        self.columns = list(preprocessor.feature_names_out_)
+        self.dtype = dtype
+        index = {name: i for i, name in enumerate(self.columns)}
+
+        self.current_year = preprocessor.current_year
+        imputer = preprocessor.imputer_
+        self.item_weights = imputer.means_["Item_Weight"].to_dict()
+        self.item_weight_mean = imputer.fallbacks_["Item_Weight"]
+        self.outlet_size_modes = imputer.modes_["Outlet_Size"].to_dict()
+        self.visibility_median = preprocessor.visibility_median_
+        classes = preprocessor.label_encoder_.classes_
+        self.outlet_codes = dict(zip(classes, range(len(classes))))
+
+        scaler = preprocessor.scaler_
+        self.numeric_slots = [index[col] for col in NUM_COLS]
+        self.numeric_mean = [float(m) for m in scaler.mean_]
+        self.numeric_scale = [float(s) for s in scaler.scale_]
+
+        levels = dict(preprocessor.categories_)
+        levels["Item_Type"] = list(preprocessor.encoder_.categories_[0])
+        # Dropped (first) levels have no column and so no slot
+        self.onehot_slots = [
+            {level: index[f"{group}_{level}"] for level in levels[group] if f"{group}_{level}" in index}
+            for group in ONEHOT_GROUPS
+        ]
+
+        self.outlet_slot = index["Outlet_Identifier"]
+        self.age_slot = index["Outlet_Age"]
+        self.non_consumable_slot = index["Non_Consumable"]
+
+    @property
+    def n_features(self):
+        return len(self.columns)
+
+    def fill(self, out, record):
+        """Write one raw record (a dict) into the 1-D array `out`, which must be zeroed."""
+        get = record.get
+        item_id = get("Item_Identifier")
+        outlet_type = get("Outlet_Type")
+
+        weight = get("Item_Weight")
+        if _missing(weight):
+            weight = self.item_weights.get(item_id, self.item_weight_mean)
+        visibility = get("Item_Visibility")
+        if visibility == 0:
+            visibility = self.visibility_median
+        mrp = get("Item_MRP")
+        numeric = (weight, visibility, mrp, mrp / weight, math.log1p(visibility))
+        for slot, value, mean, scale in zip(self.numeric_slots, numeric, self.numeric_mean, self.numeric_scale):
+            out[slot] = (value - mean) / scale
+
+        age = self.current_year - get("Outlet_Establishment_Year")
+        category = ITEM_CATEGORY_PREFIXES.get(item_id[:2]) if isinstance(item_id, str) else None
+        out[self.outlet_slot] = self.outlet_codes.get(get("Outlet_Identifier"), -1)
+        out[self.age_slot] = age
+        out[self.non_consumable_slot] = category == "Non-Consumable"
+
+        size = get("Outlet_Size")
+        if _missing(size):
+            size = self.outlet_size_modes.get(outlet_type)
+        fat = get("Item_Fat_Content")
+        levels = (
+            outlet_type,
+            FAT_CONTENT_MAP.get(fat, fat),
+            size,
+            get("Outlet_Location_Type"),
+            category,
+            _age_label(age),
+            get("Item_Type"),
+        )
+        for slots, level in zip(self.onehot_slots, levels):
+            slot = slots.get(level)
+            if slot is not None:
+                out[slot] = 1
+        return out
+
+    def transform_records(self, records):
+        """Fill a (len(records), n_features) matrix from an iterable of dicts in one pass."""
+        records = list(records)
+        out = np.zeros((len(records), self.n_features), dtype=self.dtype)
+        for row, record in zip(out, records):
+            self.fill(row, record)
+        return out
+
+    def transform_frame(self, df):
+        return self.transform_records(df.to_dict("records"))
@@ -0,0 +1,9 @@
+"""Evaluation metrics shared by the searches and the stacked ensemble."""
+
+import numpy as np
+from sklearn.metrics import mean_squared_error
+
+
+def rmse(y_true, y_pred):
+    """Root mean squared error, as a float."""
+    return float(np.sqrt(mean_squared_error(y_true, y_pred)))
@@ -0,0 +1,45 @@
+"""Estimators used in the notebook, with the hyperparameters it settled on.
+
+xgboost and lightgbm are optional: they are only imported when one of their
+models is requested.
+"""
+
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+# Baseline model zoo (`models` in the notebook)
+BASELINE_MODELS = ["Linear Regression", "Decision Tree", "Random Forest", "Gradient Boosting"]
+
+# `advanced_models` in the notebook
+ADVANCED_MODELS = ["XGBoost", "LightGBM"]
+
+# RandomizedSearchCV result: n_estimators=300, learning_rate=0.01, max_depth=5, subsample=0.9
+TUNED_GB_PARAMS = {"n_estimators": 300, "learning_rate": 0.01, "max_depth": 5, "subsample": 0.9}
+
+DEFAULT_MODEL = "LightGBM"
+
+
+def make_model(name, **params):
+    """Return a fresh, unfitted estimator by its notebook name."""
+    if name == "Linear Regression":
+        return LinearRegression(**params)
+    if name == "Decision Tree":
+        return DecisionTreeRegressor(**{"random_state": 42, **params})
+    if name == "Random Forest":
+        return RandomForestRegressor(**{"n_estimators": 100, "random_state": 42, **params})
+    if name == "Gradient Boosting":
+        return GradientBoostingRegressor(**{"n_estimators": 100, "random_state": 42, **params})
+    if name == "Tuned Gradient Boosting":
+        return GradientBoostingRegressor(**{**TUNED_GB_PARAMS, "random_state": 42, **params})
+    if name == "XGBoost":
+        from xgboost import XGBRegressor
+
+        return XGBRegressor(**{"n_estimators": 300, "learning_rate": 0.05, "max_depth": 5, "random_state": 42, **params})
+    if name == "LightGBM":
+        from lightgbm import LGBMRegressor
+
+        return LGBMRegressor(
+            **{"n_estimators": 300, "learning_rate": 0.05, "max_depth": 5, "random_state": 42, "verbose": -1, **params}
+        )
+    raise ValueError(f"Unknown model {name!r}")
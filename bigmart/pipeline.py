@@ -0,0 +1,172 @@
+"""The notebook's training pipeline as cacheable stages.
+
+    load -> impute -> clean -> engineer -> encode -> split/scale -> fit
+
+Imputation, cleaning, feature engineering and encoding are fitted on the
+whole training file and the scaler on the 80% split, in the same order as
+the notebook. Each stage takes the previous stage's output and returns
+its own; with a StageCache, stages whose inputs, parameters and code are
+unchanged are read from disk, and only the latest cached stage is loaded.
+"""
+
+from dataclasses import dataclass, field
+
+import pandas as pd
+from sklearn.metrics import r2_score
+from sklearn.model_selection import train_test_split
+
+from bigmart import artifact, drift, dtypes, features, impute, models, preprocessing, profiling
+from bigmart.artifact import ModelArtifact
+from bigmart.drift import reference_histograms
+from bigmart.dtypes import compact_features, compact_raw, read_raw_csv
+from bigmart.metrics import rmse
+from bigmart.models import DEFAULT_MODEL, make_model
+from bigmart.preprocessing import TARGET, BigMartPreprocessor
+from bigmart.stage_cache import code_key, file_key, frame_key
+
+
+def impute_stage(raw_df, current_year=2025, compact=False):
+    preprocessor = BigMartPreprocessor(current_year=current_year, compact=compact)
+    return preprocessor, preprocessor.fit_impute(compact_raw(raw_df))
+
+
+def clean_stage(value):
+    preprocessor, df = value
+    return preprocessor, preprocessor.fit_clean(df)
+
+
+def engineer_stage(value):
+    preprocessor, df = value
+    return preprocessor, preprocessor.fit_engineer(df)
+
+
+def encode_stage(value):
+    preprocessor, df = value
+    return preprocessor, preprocessor.fit_encode(df), df[TARGET]
+
+
+def split_scale_stage(value, test_size=0.2, random_state=42):
+    preprocessor, X, y = value
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=test_size, random_state=random_state)
+    X_train = preprocessor.fit_scale(X_train)
+    X_val = X_val.copy()
+    X_val[preprocessing.NUM_COLS] = preprocessor.scaler_.transform(X_val[preprocessing.NUM_COLS])
+    if preprocessor.compact:
+        # Validate on the same dtypes as training and inference
+        X_val = compact_features(X_val)
+    return preprocessor, X_train, X_val, y_train, y_val
+
+
+def fit_stage(value, model_name=DEFAULT_MODEL, model_params=None):
+    preprocessor, X_train, X_val, y_train, y_val = value
+    model = make_model(model_name, **(model_params or {}))
+    with profiling.span("model.fit", rows=len(X_train), model=model_name):
+        model.fit(X_train, y_train)
+
+    with profiling.span("model.predict", rows=len(X_val), model=model_name):
+        y_pred_val = model.predict(X_val)
+    metadata = {
+        "model_params": model_params or {},
+        "drift_reference": reference_histograms(X_train),
+        "train_rows": len(X_train),
+        "validation_rows": len(X_val),
+        "validation_rmse": rmse(y_val, y_pred_val),
+        "validation_r2": float(r2_score(y_val, y_pred_val)),
+    }
+    return ModelArtifact(model=model, preprocessor=preprocessor, model_name=model_name, metadata=metadata)
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: object
+    params: dict = field(default_factory=dict)
+    # Modules whose source, besides fn itself, determines the stage output
+    code_deps: tuple = ()
+
+    def code_key(self):
+        return code_key(self.fn, *self.code_deps)
+
+
+def training_stages(
+    model_name=DEFAULT_MODEL, model_params=None, test_size=0.2, random_state=42, current_year=2025, compact=False
+):
+    prep = (preprocessing, features, impute, dtypes)
+    return [
+        Stage("impute", impute_stage, {"current_year": current_year, "compact": compact}, prep),
+        Stage("clean", clean_stage, {}, prep),
+        Stage("engineer", engineer_stage, {}, prep),
+        Stage("encode", encode_stage, {}, prep),
+        Stage("split_scale", split_scale_stage, {"test_size": test_size, "random_state": random_state}, prep),
+        Stage("fit", fit_stage, {"model_name": model_name, "model_params": model_params}, (models, artifact, drift)),
+    ]
+
+
+def run_stages(stages, source, cache=None):
+    """Run stages on source (a CSV path or a raw DataFrame), reusing cached results.
+
+    Returns the output of the last stage.
+    """
+    if isinstance(source, pd.DataFrame):
+        input_key, load = frame_key(source), lambda: source
+    else:
+        input_key, load = file_key(source), lambda: _read_csv(source)
+
+    if cache is None:
+        value = load()
+        for stage in stages:
+            value = _run_stage(stage, value)
+        return value
+
+    keys = []
+    for stage in stages:
+        input_key = cache.key(stage.name, input_key, stage.params, stage.code_key())
+        keys.append(input_key)
+
+    # Resume after the latest stage already in the cache
+    start, value = 0, None
+    for i in reversed(range(len(stages))):
+        if cache.contains(stages[i].name, keys[i]):
+            with profiling.span("cache.load", stage=stages[i].name) as event:
+                start, value = i + 1, cache.load(stages[i].name, keys[i])
+                event["rows"] = profiling.count_rows(value)
+            break
+    if start == 0:
+        value = load()
+
+    for stage, key in zip(stages[start:], keys[start:]):
+        value = _run_stage(stage, value)
+        with profiling.span("cache.store", stage=stage.name):
+            cache.store(stage.name, key, value)
+    return value
+
+
+def _read_csv(path):
+    with profiling.span("load", path=str(path)) as event:
+        df = read_raw_csv(path)
+        event["rows"] = len(df)
+    return df
+
+
+def _run_stage(stage, value):
+    with profiling.span(stage.name, rows=profiling.count_rows(value)):
+        return stage.fn(value, **stage.params)
+
+
+def load_split(source, test_size=0.2, random_state=42, cache=None):
+    """(preprocessor, X_train, X_val, y_train, y_val) from the training pipeline, without the fit stage."""
+    stages = training_stages(test_size=test_size, random_state=random_state)[:-1]
+    return run_stages(stages, source, cache=cache)
+
+
+def train_artifact(
+    source, model_name=DEFAULT_MODEL, model_params=None, test_size=0.2, random_state=42, compact=False, cache=None
+):
+    """Fit preprocessing and model on the notebook's 80/20 split and report validation metrics.
+
+    The split matches the notebook's train_test_split, so the metrics are
+    comparable with model_performance.csv / advanced_model_performance.csv.
+    compact=True trains on the memory-compact feature dtypes (bigmart.dtypes).
+    """
+    stages = training_stages(model_name, model_params, test_size=test_size, random_state=random_state, compact=compact)
+    return run_stages(stages, source, cache=cache)
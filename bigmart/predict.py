@@ -0,0 +1,62 @@
+"""Score a raw BigMart CSV with a saved ModelArtifact.
+
+    python -m bigmart.predict bigmart_model.joblib test_AbJTz2l.csv -o bigmart_sales_final_predictions.csv
+
+Pass --chunksize to stream large inputs through the model chunk by chunk,
+and --n-jobs to score the chunks on several worker processes.
+--profile-log records per-chunk timings (see bigmart.profiling).
+"""
+
+import argparse
+
+from bigmart import profiling
+from bigmart.artifact import load_artifact
+from bigmart.dtypes import read_raw_csv
+
+ID_COLUMNS = ["Item_Identifier", "Outlet_Identifier"]
+
+
+def predict_frame(artifact, raw_df):
+    """Submission frame (identifiers + predicted Item_Outlet_Sales) for raw rows."""
+    submission_df = raw_df[ID_COLUMNS].copy()
+    submission_df["Item_Outlet_Sales"] = artifact.predict(raw_df)
+    return submission_df
+
+
+def predict_csv(artifact_path, input_csv, output_csv, chunksize=None, n_jobs=1):
+    """Score input_csv into output_csv; returns the number of rows scored."""
+    if n_jobs != 1:
+        from bigmart.batch import DEFAULT_CHUNKSIZE, score_csv_parallel
+
+        return score_csv_parallel(
+            artifact_path, input_csv, output_csv, chunksize=chunksize or DEFAULT_CHUNKSIZE, n_jobs=n_jobs
+        )
+
+    artifact = load_artifact(artifact_path)
+    if chunksize:
+        from bigmart.batch import score_csv_in_chunks
+
+        return score_csv_in_chunks(artifact, input_csv, output_csv, chunksize=chunksize)
+
+    submission_df = predict_frame(artifact, read_raw_csv(input_csv))
+    submission_df.to_csv(output_csv, index=False)
+    return len(submission_df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact")
+    parser.add_argument("input_csv")
+    parser.add_argument("-o", "--output", default="bigmart_sales_final_predictions.csv")
+    parser.add_argument("--chunksize", type=int, default=None, help="rows per chunk for streaming scoring")
+    parser.add_argument("--n-jobs", type=int, default=1, help="worker processes for chunked scoring (-1 = all cores)")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.configure_from_args(args)
+
+    n_rows = predict_csv(args.artifact, args.input_csv, args.output, chunksize=args.chunksize, n_jobs=args.n_jobs)
+    print(f"✅ {n_rows} predictions saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
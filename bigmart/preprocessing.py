@@ -0,0 +1,192 @@
+"""Fitted preprocessing from a raw BigMart frame to the model feature matrix.
+
+Mirrors the notebook steps (impute -> clean -> engineer -> encode -> scale)
+but keeps every learned statistic on the fitted object, so the exact same
+transformation can be replayed on test or production rows.
+"""
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from sklearn.utils.validation import check_is_fitted
+
+from bigmart.dtypes import compact_features
+from bigmart.features import BigMartFeatureEngineer
+from bigmart.impute import GroupImputer
+
+TARGET = "Item_Outlet_Sales"
+
+FAT_CONTENT_MAP = {"LF": "Low Fat", "low fat": "Low Fat", "reg": "Regular"}
+
+# One-hot encoded with pd.get_dummies(drop_first=True), in notebook order
+DUMMY_COLUMNS = [
+    "Outlet_Type",
+    "Item_Fat_Content",
+    "Outlet_Size",
+    "Outlet_Location_Type",
+    "Item_Category",
+    "Outlet_Age_Category",
+]
+ITEM_TYPE_COLUMN = ["Item_Type"]
+DROP_COLUMNS = ["Item_Identifier", "Outlet_Establishment_Year"]
+NUM_COLS = ["Item_Weight", "Item_Visibility", "Item_MRP", "Price_per_Unit_Weight", "Item_Visibility_Log"]
+
+# Raw attributes that are constant per Item_Identifier / Outlet_Identifier
+ITEM_ATTRIBUTES = ["Item_Weight", "Item_Fat_Content", "Item_Type"]
+OUTLET_ATTRIBUTES = ["Outlet_Establishment_Year", "Outlet_Size", "Outlet_Location_Type", "Outlet_Type"]
+
+
+class BigMartPreprocessor(BaseEstimator, TransformerMixin):
+    """Turns raw train/test rows into the feature matrix the models were fit on.
+
+    Fitted state:
+    - imputer_: GroupImputer (Item_Weight by Item_Identifier, Outlet_Size by Outlet_Type)
+    - item_attributes_ / outlet_attributes_: imputed raw attributes per identifier
+    - visibility_median_: replacement for zero Item_Visibility
+    - categories_: levels seen for every one-hot column
+    - label_encoder_: Outlet_Identifier LabelEncoder (unseen outlets become -1)
+    - encoder_: Item_Type OneHotEncoder
+    - scaler_: StandardScaler over NUM_COLS
+    - feature_names_out_: final column order (X_final_train.columns)
+
+    With compact=True the output matrix uses uint8 one-hot columns, small
+    integers and float32 numeric features (see bigmart.dtypes).
+    """
+
+    def __init__(self, current_year=2025, compact=False):
+        self.current_year = current_year
+        self.compact = compact
+
+    def fit(self, X, y=None):
+        df = self.fit_impute(X)
+        df = self.fit_clean(df)
+        df = self.fit_engineer(df)
+        self.fit_scale(self.fit_encode(df))
+        return self
+
+    # Stage-wise fitting: each step fits its part of the state and returns the
+    # transformed frame, so a pipeline can cache the stages independently.
+
+    def fit_impute(self, df):
+        self.imputer_ = GroupImputer().fit(df)
+        imputed = self.imputer_.transform(df)
+        self.item_attributes_ = _attributes(imputed, "Item_Identifier", ITEM_ATTRIBUTES)
+        self.outlet_attributes_ = _attributes(imputed, "Outlet_Identifier", OUTLET_ATTRIBUTES)
+        return imputed
+
+    def fit_clean(self, df):
+        self.visibility_median_ = float(df.loc[df["Item_Visibility"] > 0, "Item_Visibility"].median())
+        return self._clean(df)
+
+    def fit_engineer(self, df):
+        self.feature_engineer_ = BigMartFeatureEngineer(current_year=self.current_year)
+        return self.feature_engineer_.fit_transform(df)
+
+    def fit_encode(self, df):
+        self.categories_ = {}
+        for col in DUMMY_COLUMNS:
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                self.categories_[col] = list(df[col].cat.categories)
+            else:
+                self.categories_[col] = sorted(df[col].dropna().unique())
+
+        self.label_encoder_ = LabelEncoder().fit(df["Outlet_Identifier"])
+        self.encoder_ = OneHotEncoder(
+            drop="first", sparse_output=False, handle_unknown="ignore", dtype=np.uint8 if self.compact else np.float64
+        )
+        self.encoder_.fit(df[ITEM_TYPE_COLUMN])
+        return self._encode(df)
+
+    def fit_scale(self, encoded):
+        self.scaler_ = StandardScaler().fit(encoded[NUM_COLS])
+        self.feature_names_out_ = np.asarray(encoded.columns, dtype=object)
+        encoded = encoded.copy()
+        encoded[NUM_COLS] = self.scaler_.transform(encoded[NUM_COLS])
+        return compact_features(encoded) if self.compact else encoded
+
+    def partial_fit(self, X, y=None):
+        """Update the imputation tables and the per-identifier attributes with new raw rows.
+
+        Identifiers in X take their attributes from X (their first row there),
+        so an outlet whose size is filled in or an item that is re-typed is
+        scored with its current attributes; new identifiers are added. The
+        cleaning median, one-hot levels, outlet labels and scaler stay as
+        fitted: a model trained on this feature space keeps its meaning, so it
+        can continue training on the new rows. Levels those encoders have never
+        seen are reported by unseen_levels.
+        """
+        check_is_fitted(self, "feature_names_out_")
+        self.imputer_.partial_fit(X)
+        imputed = self.imputer_.transform(X)
+        self.item_attributes_ = _refresh(self.item_attributes_, imputed, "Item_Identifier", ITEM_ATTRIBUTES)
+        self.outlet_attributes_ = _refresh(self.outlet_attributes_, imputed, "Outlet_Identifier", OUTLET_ATTRIBUTES)
+        return self
+
+    def unseen_levels(self, X):
+        """{column: levels in X that the fitted encoders have not seen}, for the encoded columns."""
+        check_is_fitted(self, "feature_names_out_")
+        df = self.feature_engineer_.transform(self._clean(self.imputer_.transform(X)))
+        known = {**self.categories_, "Outlet_Identifier": self.label_encoder_.classes_}
+        known.update(zip(ITEM_TYPE_COLUMN, self.encoder_.categories_))
+        unseen = {}
+        for col, levels in known.items():
+            new = sorted(set(df[col].dropna().unique()) - set(levels))
+            if new:
+                unseen[col] = new
+        return unseen
+
+    def transform(self, X):
+        check_is_fitted(self, "feature_names_out_")
+        df = self.imputer_.transform(X)
+        df = self.feature_engineer_.transform(self._clean(df))
+        encoded = self._encode(df, columns=self.feature_names_out_)
+        encoded[NUM_COLS] = self.scaler_.transform(encoded[NUM_COLS])
+        return compact_features(encoded) if self.compact else encoded
+
+    def get_feature_names_out(self, input_features=None):
+        check_is_fitted(self, "feature_names_out_")
+        return self.feature_names_out_
+
+    def _clean(self, df):
+        fat_content = df["Item_Fat_Content"].replace(FAT_CONTENT_MAP)
+        if isinstance(fat_content.dtype, pd.CategoricalDtype):
+            # replace() keeps the merged spellings as empty categories
+            fat_content = fat_content.cat.remove_unused_categories()
+        df["Item_Fat_Content"] = fat_content
+        df.loc[df["Item_Visibility"] == 0, "Item_Visibility"] = self.visibility_median_
+        return df
+
+    def _encode(self, df, columns=None):
+        for col in DUMMY_COLUMNS:
+            df[col] = pd.Categorical(df[col], categories=self.categories_[col])
+        df = pd.get_dummies(df, columns=DUMMY_COLUMNS, drop_first=True, dtype=np.uint8 if self.compact else bool)
+
+        # LabelEncoder classes are sorted, so the position is the label; unseen outlets get -1
+        outlet_codes = pd.Index(self.label_encoder_.classes_).get_indexer(df["Outlet_Identifier"])
+        df["Outlet_Identifier"] = outlet_codes.astype(np.int64)
+
+        item_type = pd.DataFrame(
+            self.encoder_.transform(df[ITEM_TYPE_COLUMN]),
+            columns=self.encoder_.get_feature_names_out(ITEM_TYPE_COLUMN),
+            index=df.index,
+        )
+        df = df.drop(columns=DROP_COLUMNS + ITEM_TYPE_COLUMN + [TARGET], errors="ignore").join(item_type)
+
+        if columns is not None:
+            # Columns missing from this frame (levels absent from the batch) are all zeros
+            df = df.reindex(columns=columns, fill_value=0)
+        return df
+
+
+def _attributes(imputed, key, columns):
+    """First row of every identifier, indexed by the identifier as plain strings."""
+    attributes = imputed.drop_duplicates(key)
+    return attributes[columns].set_axis(pd.Index(np.asarray(attributes[key], dtype=object), name=key))
+
+
+def _refresh(attributes, imputed, key, columns):
+    """attributes with every identifier in imputed set to its first row there; new identifiers go last."""
+    new = _attributes(imputed, key, columns)
+    order = attributes.index.append(new.index[~new.index.isin(attributes.index)])
+    return pd.concat([attributes[~attributes.index.isin(new.index)], new]).reindex(order)
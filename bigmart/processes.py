@@ -0,0 +1,56 @@
+"""Process-level helpers shared by the benchmark, batch scoring, the EDA and the concurrent model fits."""
+
+import multiprocessing
+import os
+import re
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+def resolve_n_jobs(n_jobs):
+    """Cores to use for n_jobs, counted like joblib (-1: all, -2: all but one)."""
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+def reset_peak_rss():
+    """Reset the kernel's high-water mark where supported (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process (since the last reset_peak_rss, on Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r"VmHWM:\s+(\d+)", f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def model_pool(n_tasks, n_jobs=-1, workers=None, preload=()):
+    """(ProcessPoolExecutor, threads per worker) for n_tasks model fits on n_jobs cores.
+
+    workers defaults to one per task (at most one per core), and each gets
+    n_jobs // workers threads. Every task runs in a fresh process, so
+    peak_rss_mb is that task's peak. Workers are forked from a server that
+    has already imported the modules in preload.
+    """
+    cores = resolve_n_jobs(n_jobs)
+    workers = workers or min(n_tasks, cores)
+    context = None
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(preload))
+    pool = ProcessPoolExecutor(workers, mp_context=context, max_tasks_per_child=1)
+    return pool, max(1, cores // workers)
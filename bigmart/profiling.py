@@ -0,0 +1,145 @@
+"""Opt-in timing and profiling events for pipeline stages and model calls.
+
+Instrumented code wraps its work in span():
+
+    with profiling.span("fit", rows=len(X_train), model=model_name):
+        model.fit(X_train, y_train)
+
+When profiling is off (the default) a span costs one dictionary lookup.
+When it is on, every span appends a JSON line to the event log with its
+wall time, CPU time, row count and (with trace_memory) the peak Python
+allocation. With profile_dir set, each outermost span also dumps a
+cProfile file, <profile_dir>/<name>-<pid>-<n>.prof. Open it with pstats
+or snakeviz.
+
+Profiling is switched on by configure() or the CLIs' --profile-log /
+--profile-dir flags. It can also be switched on through the environment,
+which worker processes inherit:
+
+    BIGMART_PROFILE_LOG=profile.jsonl BIGMART_PROFILE_DIR=prof/ python -m bigmart.predict ...
+"""
+
+import cProfile
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+LOG_ENV = "BIGMART_PROFILE_LOG"
+DIR_ENV = "BIGMART_PROFILE_DIR"
+MEMORY_ENV = "BIGMART_PROFILE_MEMORY"
+
+_lock = threading.Lock()
+_local = threading.local()
+_dump_counter = itertools.count()
+
+
+def configure(log_path=None, profile_dir=None, trace_memory=False):
+    """Turn profiling on (or off, with no arguments) for this process and its workers."""
+    for name, value in ((LOG_ENV, log_path), (DIR_ENV, profile_dir), (MEMORY_ENV, "1" if trace_memory else None)):
+        if value:
+            os.environ[name] = str(value)
+        else:
+            os.environ.pop(name, None)
+
+
+def enabled():
+    return bool(os.environ.get(LOG_ENV) or os.environ.get(DIR_ENV))
+
+
+def count_rows(value):
+    """Rows of a DataFrame/array, or of the first one inside a stage's tuple output."""
+    if isinstance(value, tuple):
+        return next((n for n in map(count_rows, value) if n is not None), None)
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name, rows=None, **fields):
+    """Time the enclosed block as one event; extra fields go into the event as is.
+
+    The yielded dict can be updated inside the block (e.g. with the number of
+    output rows).
+    """
+    if not enabled():
+        yield {}
+        return
+
+    event = {"event": name, "rows": rows, **fields}
+    stack = _stack()
+    trace_memory = bool(os.environ.get(MEMORY_ENV))
+    if trace_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if stack:
+            # Keep the enclosing span's peak before resetting it for this one
+            stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        start_traced = tracemalloc.get_traced_memory()[0]
+
+    profile_dir = os.environ.get(DIR_ENV)
+    # Only one cProfile can be active at a time, so nested spans are covered by the outermost one
+    profiler = cProfile.Profile() if profile_dir and not any(s.get("_profiled") for s in stack) else None
+    event["_profiled"] = profiler is not None
+
+    stack.append(event)
+    started_wall, started_cpu = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield event
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        event["wall_seconds"] = time.perf_counter() - started_wall
+        event["cpu_seconds"] = time.process_time() - started_cpu
+        stack.pop()
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, event.pop("_peak", 0))
+            event["allocated_mb"] = (current - start_traced) / 1024**2
+            event["peak_allocated_mb"] = (peak - start_traced) / 1024**2
+            if stack:
+                stack[-1]["_peak"] = max(stack[-1].get("_peak", 0), peak)
+        event.pop("_peak", None)
+        del event["_profiled"]
+        if profiler is not None:
+            os.makedirs(profile_dir, exist_ok=True)
+            path = os.path.join(profile_dir, f"{name}-{os.getpid()}-{next(_dump_counter)}.prof")
+            profiler.dump_stats(path)
+            event["profile"] = path
+        if event["rows"] and event["wall_seconds"] > 0:
+            event["rows_per_sec"] = event["rows"] / event["wall_seconds"]
+        event.update(pid=os.getpid(), thread=threading.current_thread().name, time=time.time(), depth=len(stack))
+        _write(event)
+
+
+def _write(event):
+    log_path = os.environ.get(LOG_ENV)
+    if not log_path:
+        return
+    line = json.dumps(event, default=str) + "\n"
+    with _lock, open(log_path, "a") as f:
+        f.write(line)
+
+
+def add_arguments(parser):
+    """--profile-log / --profile-dir / --profile-memory flags for a CLI."""
+    parser.add_argument("--profile-log", default=None, help="append per-stage timing events (JSON lines) here")
+    parser.add_argument("--profile-dir", default=None, help="dump a cProfile file per stage into this directory")
+    parser.add_argument("--profile-memory", action="store_true", help="trace Python allocations (slower)")
+
+
+def configure_from_args(args):
+    if args.profile_log or args.profile_dir:
+        configure(args.profile_log, args.profile_dir, trace_memory=args.profile_memory)
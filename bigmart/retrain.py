@@ -0,0 +1,71 @@
+"""Update a saved model with a new period of sales (see bigmart.incremental).
+
+    python -m bigmart.retrain bigmart_model.joblib sales_week_42.csv -o bigmart_model.joblib
+    python -m bigmart.retrain bigmart_model.joblib sales_week_42.csv --history train_v9rqX0R.csv --max-psi 0.2
+
+The model continues boosting on the new rows unless their feature
+distribution has drifted beyond --max-psi or they contain unseen
+categories. In that case it is rebuilt from --history plus the new rows.
+Stacked ensembles (bigmart.stack) are always rebuilt.
+"""
+
+import argparse
+import sys
+
+from bigmart.artifact import load_artifact, save_artifact
+from bigmart.drift import DEFAULT_MAX_PSI
+from bigmart.dtypes import read_raw_csv
+from bigmart.incremental import DEFAULT_UPDATE_TREES, update_artifact
+from bigmart.stage_cache import DEFAULT_CACHE_DIR, StageCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact")
+    parser.add_argument("new_csv", help="new labelled rows in the raw training format")
+    parser.add_argument("-o", "--output", default=None, help="defaults to overwriting the input artifact")
+    parser.add_argument("--history", default=None, help="raw training CSV for a full rebuild")
+    parser.add_argument("--update-trees", type=int, default=DEFAULT_UPDATE_TREES, help="trees to add per update")
+    parser.add_argument("--max-psi", type=float, default=DEFAULT_MAX_PSI, help="drift limit before a rebuild")
+    parser.add_argument("--force-rebuild", action="store_true")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage on rebuild")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.artifact)
+    new_df = read_raw_csv(args.new_csv)
+    cache = None if args.no_cache else StageCache(args.cache_dir)
+    try:
+        updated, report, action = update_artifact(
+            artifact,
+            new_df,
+            history=args.history,
+            update_trees=args.update_trees,
+            max_psi=args.max_psi,
+            force_rebuild=args.force_rebuild,
+            cache=cache,
+        )
+    except (TypeError, ValueError) as exc:
+        print(f"❌ {exc}")
+        return 1
+
+    psi = ", ".join(f"{col} {value:.3f}" for col, value in report.psi.items())
+    print(f"📊 Drift over {report.rows} rows - PSI: {psi}")
+    if report.unseen:
+        print(f"⚠️ Unseen levels: {report.unseen}")
+    if action == "rebuilt":
+        print(f"🔄 Rebuilt {updated.model_name} from history + new rows - "
+              f"Validation RMSE: {updated.metadata['validation_rmse']:.2f}")
+    else:
+        last = updated.metadata["updates"][-1]
+        print(f"✅ Continued {updated.model_name} with {last['trees_added']} trees on {last['rows']} rows "
+              f"(RMSE on the batch before updating: {last['rmse_before_update']:.2f})")
+
+    output = args.output or args.artifact
+    save_artifact(updated, output)
+    print(f"✅ Model artifact saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""Online prediction service with micro-batching.
+
+Concurrent single-record requests are queued and scored together, so one
+vectorized predict call serves many callers. A batch is flushed when it
+reaches max_batch_size or when its oldest request has waited max_wait_ms.
+
+Repeated records are answered from a bounded LRU PredictionCache before
+they reach the queue. Entries are keyed on the loaded model (artifact
+version and file hash) and the record's model inputs. POST /reload reads
+the artifact file given on the command line again (replace that file to
+deploy a new model); it never loads a path sent by the client, since
+artifacts are pickles. A changed model drops every cache entry.
+
+    python -m bigmart.serve bigmart_model.joblib --port 8000 --cache-size 100000
+
+    curl -X POST localhost:8000/predict -d '{"Item_Identifier": "FDW58", ...}'
+    curl -X POST localhost:8000/reload
+    curl localhost:8000/stats
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from bigmart.artifact import load_artifact
+from bigmart.dtypes import OPTIONAL_COLUMNS, RAW_SCHEMA
+from bigmart.stage_cache import file_key
+
+DEFAULT_CACHE_SIZE = 100_000
+
+# Raw fields a prediction depends on, in key order
+RECORD_FIELDS = [col for col in RAW_SCHEMA if col not in OPTIONAL_COLUMNS]
+
+
+class LatencyTracker:
+    """Rolling window of request latencies (seconds) with percentile summaries."""
+
+    def __init__(self, window=10_000):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        with self._lock:
+            latencies = np.array(self._latencies)
+            count = self.count
+        if latencies.size == 0:
+            return {"count": count, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+        return {"count": count, "p50_ms": float(p50), "p99_ms": float(p99)}
+
+
+def _canonical(value):
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float, np.number)):
+        value = float(value)
+        return None if value != value else value
+    return str(value)
+
+
+def record_key(record):
+    """Canonical hashable form of a raw record: model inputs only, numbers as float, missing as None."""
+    return tuple(_canonical(record.get(col)) for col in RECORD_FIELDS)
+
+
+class PredictionCache:
+    """Bounded LRU map from (model key, record_key(record)) to a prediction.
+
+    set_model switches to a new model key and drops every entry, so a
+    prediction is only ever served by the model that computed it.
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.model_key = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def set_model(self, model_key):
+        with self._lock:
+            if model_key != self.model_key:
+                if self._entries:
+                    self.invalidations += 1
+                self._entries.clear()
+                self.model_key = model_key
+
+    def key(self, record):
+        return self.model_key, record_key(record)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key[0] != self.model_key:
+                # Scored for a model that has since been replaced
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ServedModel:
+    """The artifact being served. reload swaps in a new one and re-keys the prediction cache."""
+
+    def __init__(self, path, cache=None):
+        self.cache = cache
+        self.reload(path)
+
+    def reload(self, path=None):
+        path = path or self.path
+        artifact = load_artifact(path)
+        model_key = f"{artifact.version}:{file_key(path)}"
+        # Swap the model before the cache key: a batch scored in between is stored under the old key and dropped
+        self.artifact, self.path, self.model_key = artifact, path, model_key
+        if self.cache is not None:
+            self.cache.set_model(model_key)
+        return artifact
+
+    def predict_records(self, records):
+        return self.artifact.predict_records(records)
+
+
+class MicroBatcher:
+    """Collects concurrent records into batches for a single predict call.
+
+    predict_batch takes a list of raw record dicts and returns one
+    prediction per record, e.g. ModelArtifact.predict_records. With a
+    PredictionCache, cached records are answered without queueing and new
+    predictions are added to it. If a batch fails, its records are scored
+    one at a time, so an invalid record only fails its own request.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=64, max_wait_ms=5.0, cache=None):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.cache = cache
+        self.latency = LatencyTracker()
+        self._batch_sizes = deque(maxlen=10_000)
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="bigmart-microbatcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        """Queue one raw record (dict); returns a Future for its prediction."""
+        future = Future()
+        started = time.perf_counter()
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(record)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.latency.record(time.perf_counter() - started)
+                future.set_result(cached)
+                return future
+        self._queue.put((record, future, started, key))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout=timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._worker.join()
+
+    def stats(self):
+        summary = self.latency.summary()
+        sizes = np.array(self._batch_sizes)
+        summary["mean_batch_size"] = float(sizes.mean()) if sizes.size else None
+        if self.cache is not None:
+            summary["cache"] = self.cache.stats()
+        return summary
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first[2] + self.max_wait_ms / 1000
+            stop = False
+            while len(batch) < self.max_batch_size:
+                # Past the deadline, still take whatever queued up while the last batch was scored
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._score(batch)
+            if stop:
+                return
+
+    def _score(self, batch):
+        records, futures, started, keys = zip(*batch)
+        try:
+            predictions = self.predict_batch(list(records))
+        except Exception as exc:
+            if len(batch) == 1:
+                futures[0].set_exception(exc)
+                return
+            # One bad record fails the whole batch: rescore one by one so only its caller gets the error
+            for item in batch:
+                self._score([item])
+            return
+        finished = time.perf_counter()
+        self._batch_sizes.append(len(batch))
+        for future, prediction, start, key in zip(futures, predictions, started, keys):
+            self.latency.record(finished - start)
+            if key is not None:
+                self.cache.put(key, float(prediction))
+            future.set_result(float(prediction))
+
+
+def make_handler(batcher, served=None):
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path not in ("/predict", "/reload") or (self.path == "/reload" and served is None):
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length)) if length or self.path == "/predict" else {}
+            except json.JSONDecodeError as exc:
+                self._reply(400, {"error": f"invalid JSON: {exc}"})
+                return
+            if self.path == "/reload":
+                self._reload(payload)
+                return
+            records = payload if isinstance(payload, list) else [payload]
+            try:
+                futures = [batcher.submit(record) for record in records]
+                predictions = [future.result() for future in futures]
+            except Exception as exc:
+                self._reply(422, {"error": str(exc)})
+                return
+            self._reply(200, {"Item_Outlet_Sales": predictions if isinstance(payload, list) else predictions[0]})
+
+        def _reload(self, payload):
+            if isinstance(payload, dict) and payload.get("artifact"):
+                # Unpickling a client-chosen file would run arbitrary code
+                self._reply(400, {"error": "reload re-reads the served artifact file; replace that file instead"})
+                return
+            try:
+                artifact = served.reload()
+            except (OSError, TypeError, ValueError) as exc:
+                self._reply(422, {"error": str(exc)})
+                return
+            self._reply(200, {"model": artifact.model_name, "model_key": served.model_key})
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._reply(200, batcher.stats())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def _reply(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="cached predictions (0 disables)")
+    args = parser.parse_args(argv)
+
+    cache = PredictionCache(args.cache_size) if args.cache_size > 0 else None
+    served = ServedModel(args.artifact, cache=cache)
+    batcher = MicroBatcher(
+        served.predict_records, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, cache=cache
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(batcher, served))
+    print(f"✅ Serving {served.artifact.model_name} on http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+        print(f"📊 Latency: {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
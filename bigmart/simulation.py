@@ -0,0 +1,139 @@
+"""What-if Item_MRP simulation: predicted sales over a grid of prices.
+
+    python -m bigmart.simulation bigmart_model.joblib test_AbJTz2l.csv --multipliers 0.5 1.5 50 -o price_response.csv
+    python -m bigmart.simulation bigmart_model.joblib test_AbJTz2l.csv --prices 50 250 41 --by row
+
+price_response scores every item x outlet row of a raw frame at every
+point of a price grid: absolute MRP values, or multipliers of each row's
+own MRP. The feature matrix of the rows is built once. Only Item_MRP and
+Price_per_Unit_Weight depend on the price, so the matrix is tiled once
+per grid point and just those two scaled columns are rewritten. The whole
+(rows x points) tensor is then scored in one predict call, in blocks of at
+most block_rows rows to bound memory.
+
+Each point's predictions equal what predict gives for the frame with
+Item_MRP set to that price.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from bigmart.dtypes import read_raw_csv
+
+# Rows of the tiled feature tensor scored per predict call
+DEFAULT_BLOCK_ROWS = 1_000_000
+
+
+@dataclass
+class PriceResponse:
+    """Predicted sales for each raw row (rows of sales) at each grid point (columns)."""
+
+    keys: pd.DataFrame
+    grid: np.ndarray
+    sales: np.ndarray
+    # "price" (grid is Item_MRP) or "multiplier" (grid scales each row's Item_MRP)
+    kind: str = "multiplier"
+
+    def prices(self):
+        """Item_MRP of each (row, grid point)."""
+        base = self.keys["Item_MRP"].to_numpy(dtype=float)[:, None]
+        return base * self.grid if self.kind == "multiplier" else np.broadcast_to(self.grid, self.sales.shape)
+
+    def to_frame(self):
+        """One row per (raw row, grid point)."""
+        n_points = len(self.grid)
+        frame = self.keys.loc[self.keys.index.repeat(n_points)].reset_index(drop=True)
+        frame[self.kind.capitalize()] = np.tile(self.grid, len(self.keys))
+        frame["Simulated_MRP"] = self.prices().ravel()
+        frame["Item_Outlet_Sales"] = self.sales.ravel()
+        return frame
+
+    def by_item(self):
+        """Item_Identifier x grid point table of predicted sales summed over outlets."""
+        surface = pd.DataFrame(self.sales, columns=self.grid)
+        surface.columns.name = self.kind
+        item = self.keys["Item_Identifier"].astype(str).to_numpy()
+        return surface.groupby(item, sort=True).sum().rename_axis("Item_Identifier")
+
+
+def _price_columns(artifact):
+    """(slot, mean, scale) of the Item_MRP and Price_per_Unit_Weight features."""
+    slots = artifact.dimensions.numeric_slots
+    return slots["Item_MRP"], slots["Price_per_Unit_Weight"]
+
+
+def _imputed_weights(artifact, raw_df):
+    """Item_Weight of each row as the preprocessor fills it (the divisor of Price_per_Unit_Weight)."""
+    columns = [col for col in raw_df.columns if col in ("Item_Identifier", "Item_Weight", "Outlet_Size", "Outlet_Type")]
+    imputed = artifact.preprocessor.imputer_.transform(raw_df[columns].copy())
+    return imputed["Item_Weight"].to_numpy(dtype=float)
+
+
+def price_response(artifact, raw_df, prices=None, multipliers=None, block_rows=DEFAULT_BLOCK_ROWS):
+    """PriceResponse of artifact's predictions for raw_df at each price or multiplier."""
+    if (prices is None) == (multipliers is None):
+        raise ValueError("pass exactly one of prices or multipliers")
+    kind = "price" if prices is not None else "multiplier"
+    grid = np.asarray(prices if prices is not None else multipliers, dtype=float).ravel()
+    raw_df = raw_df.reset_index(drop=True)
+
+    X = np.asarray(artifact.dimensions.transform(raw_df))
+    base_mrp = raw_df["Item_MRP"].to_numpy(dtype=float)
+    weight = _imputed_weights(artifact, raw_df)
+    (mrp_slot, mrp_mean, mrp_scale), (ppw_slot, ppw_mean, ppw_scale) = _price_columns(artifact)
+
+    n_rows, n_points = len(raw_df), len(grid)
+    sales = np.empty((n_rows, n_points), dtype=float)
+    rows_per_block = max(1, block_rows // max(1, n_points))
+    for start in range(0, n_rows, rows_per_block):
+        stop = min(start + rows_per_block, n_rows)
+        # (row, point) pairs, row-major: the block's rows each repeated n_points times
+        tensor = np.repeat(X[start:stop], n_points, axis=0)
+        mrp = (base_mrp[start:stop, None] * grid if kind == "multiplier"
+               else np.broadcast_to(grid, (stop - start, n_points))).ravel()
+        tensor[:, mrp_slot] = (mrp - mrp_mean) / mrp_scale
+        tensor[:, ppw_slot] = (mrp / np.repeat(weight[start:stop], n_points) - ppw_mean) / ppw_scale
+        sales[start:stop] = np.asarray(artifact.predict_matrix(tensor), dtype=float).reshape(stop - start, n_points)
+
+    keys = raw_df[["Item_Identifier", "Outlet_Identifier", "Item_MRP"]].copy()
+    return PriceResponse(keys=keys, grid=grid, sales=sales, kind=kind)
+
+
+def main(argv=None):
+    from bigmart.artifact import load_artifact
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("artifact")
+    parser.add_argument("input_csv", help="raw item x outlet rows to simulate")
+    grid = parser.add_mutually_exclusive_group(required=True)
+    grid.add_argument("--multipliers", type=float, nargs=3, metavar=("START", "STOP", "NUM"),
+                      help="np.linspace of multipliers of each row's Item_MRP")
+    grid.add_argument("--prices", type=float, nargs=3, metavar=("START", "STOP", "NUM"),
+                      help="np.linspace of absolute Item_MRP values")
+    parser.add_argument("--by", choices=["item", "row"], default="item",
+                        help="per-item surface (summed over outlets) or one line per row and grid point")
+    parser.add_argument("-o", "--output", default="price_response.csv")
+    args = parser.parse_args(argv)
+
+    artifact = load_artifact(args.artifact)
+    raw_df = read_raw_csv(args.input_csv)
+    start, stop, num = args.multipliers or args.prices
+    points = np.linspace(start, stop, int(num))
+    if args.multipliers:
+        response = price_response(artifact, raw_df, multipliers=points)
+    else:
+        response = price_response(artifact, raw_df, prices=points)
+    print(f"✅ Scored {len(raw_df):,} rows x {len(points)} {response.kind} points")
+
+    output = response.by_item() if args.by == "item" else response.to_frame()
+    output.to_csv(args.output, index=args.by == "item")
+    print(f"✅ Price response saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Train a stacked ensemble of the boosted models (see bigmart.stacking).
+
+    python -m bigmart.stack train_v9rqX0R.csv -o bigmart_model.joblib
+    python -m bigmart.stack train_v9rqX0R.csv --models XGBoost LightGBM --cv 5
+
+Each base model's out-of-fold and validation predictions are cached, so
+rerunning with a different --models list only fits the models that are new.
+"""
+
+import argparse
+import sys
+
+from bigmart import profiling
+from bigmart.artifact import save_artifact
+from bigmart.stacking import DEFAULT_BASE_MODELS, DEFAULT_CV, train_stacked_artifact
+from bigmart.stage_cache import DEFAULT_CACHE_DIR, StageCache
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("train_csv")
+    parser.add_argument("--models", nargs="+", default=DEFAULT_BASE_MODELS, help="base models to blend")
+    parser.add_argument("--cv", type=int, default=DEFAULT_CV, help="folds for the out-of-fold predictions")
+    parser.add_argument("-o", "--output", default="bigmart_model.joblib")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="cores to use (-1: all)")
+    parser.add_argument("--workers", type=int, default=None, help="base models fitted concurrently")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.configure_from_args(args)
+
+    cache = None if args.no_cache else StageCache(args.cache_dir)
+    print(f"🔄 Out-of-fold predictions for {', '.join(args.models)} ({args.cv} folds)... ⏳")
+    artifact, summary = train_stacked_artifact(
+        args.train_csv, names=args.models, cv=args.cv, cache=cache, n_jobs=args.n_jobs, workers=args.workers
+    )
+    print("\n📊 Stacked Ensemble:")
+    print(summary.round(4).to_string())
+
+    save_artifact(artifact, args.output)
+    print(f"\n✅ Stacked model saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""Stacked ensemble of the notebook's boosted models over cached out-of-fold predictions.
+
+Each base model (Gradient Boosting, XGBoost and LightGBM by default)
+provides:
+
+- out-of-fold predictions on the training split (K-fold);
+- its predictions on the validation split;
+- a copy fitted on the whole training split.
+
+These are computed once per model, in parallel worker processes, and
+stored in the StageCache under a key made of the split's data, the model's
+name and parameters, the folds and the code of this module and
+bigmart.models. Adding or removing a base model, or refitting the blender,
+only computes what is not cached yet.
+
+The blender is a non-negative linear regression on the out-of-fold
+predictions: one weight per base model plus an intercept.
+StackedEnsemble.predict runs the base models concurrently, in threads,
+on one shared feature matrix, then blends their predictions.
+"""
+
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from threadpoolctl import threadpool_limits
+
+from bigmart import models, profiling
+from bigmart.artifact import ModelArtifact, predict_model
+from bigmart.drift import reference_histograms
+from bigmart.metrics import rmse
+from bigmart.models import make_model
+from bigmart.pipeline import load_split
+from bigmart.processes import model_pool
+from bigmart.stage_cache import code_key, frame_key
+
+DEFAULT_BASE_MODELS = ["Gradient Boosting", "XGBoost", "LightGBM"]
+DEFAULT_CV = 5
+STACKED_MODEL_NAME = "Stacked"
+
+
+def out_of_fold(name, X_train, y_train, X_val, params=None, cv=DEFAULT_CV, random_state=42, threads=1):
+    """{"oof", "val", "model", "seconds"} for one base model.
+
+    oof holds the K-fold predictions for every training row, val the
+    predictions of the model refitted on all of X_train, which is "model".
+    """
+    started = time.perf_counter()
+    params = params or {}
+
+    def fit(X, y, fold):
+        model = make_model(name, **params)
+        if "n_jobs" in model.get_params():
+            model.set_params(n_jobs=threads)
+        with profiling.span("model.fit", rows=len(X), model=name, fold=fold):
+            return model.fit(X, y)
+
+    def predict(model, X, fold):
+        with profiling.span("model.predict", rows=len(X), model=name, fold=fold):
+            return model.predict(X)
+
+    oof = np.empty(len(X_train), dtype=float)
+    with threadpool_limits(limits=threads):
+        folds = KFold(n_splits=cv, shuffle=True, random_state=random_state).split(X_train)
+        for fold, (train_idx, test_idx) in enumerate(folds):
+            model = fit(X_train.iloc[train_idx], y_train.iloc[train_idx], fold)
+            oof[test_idx] = predict(model, X_train.iloc[test_idx], fold)
+        # The refit on the whole training split is logged with fold None
+        model = fit(X_train, y_train, None)
+        val = predict(model, X_val, None)
+    return {"oof": oof, "val": np.asarray(val, dtype=float), "model": model, "seconds": time.perf_counter() - started}
+
+
+def _oof_key(cache, input_key, name, params, cv, random_state):
+    return cache.key(
+        "oof", input_key, {"model": name, "params": params, "cv": cv, "random_state": random_state},
+        code_key(out_of_fold, models),
+    )
+
+
+def base_predictions(
+    names, X_train, y_train, X_val, model_params=None, cv=DEFAULT_CV, random_state=42, cache=None, n_jobs=-1,
+    workers=None,
+):
+    """{name: out_of_fold(...) result}, reading cached models and computing the rest concurrently.
+
+    model_params maps a model name to its hyperparameters. Models missing
+    from the cache are fitted in a process pool, with n_jobs cores divided
+    between the workers as in bigmart.compare.
+    """
+    model_params = model_params or {}
+    results, keys = {}, {}
+    if cache is not None:
+        input_key = frame_key(X_train) + frame_key(y_train.to_frame()) + frame_key(X_val)
+        for name in names:
+            keys[name] = _oof_key(cache, input_key, name, model_params.get(name, {}), cv, random_state)
+            if cache.contains("oof", keys[name]):
+                results[name] = cache.load("oof", keys[name])
+
+    missing = [name for name in names if name not in results]
+    if missing:
+        pool, threads = model_pool(len(missing), n_jobs=n_jobs, workers=workers, preload=["bigmart.stacking"])
+        with pool:
+            futures = {
+                name: pool.submit(
+                    out_of_fold, name, X_train, y_train, X_val, model_params.get(name, {}), cv, random_state, threads
+                )
+                for name in missing
+            }
+            for name, future in futures.items():
+                results[name] = future.result()
+                if cache is not None:
+                    cache.store("oof", keys[name], results[name])
+    return {name: results[name] for name in names}
+
+
+class StackedEnsemble:
+    """Base models fitted on the training split, blended by a linear model fitted on their out-of-fold predictions."""
+
+    def __init__(self, names, base_models, blender):
+        self.names = list(names)
+        self.base_models = list(base_models)
+        self.blender = blender
+        self._executor = None
+
+    @property
+    def weights(self):
+        return dict(zip(self.names, self.blender.coef_))
+
+    def base_predict(self, X):
+        """(n_rows, n_models) base-model predictions, computed concurrently on one shared matrix."""
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(len(self.base_models), thread_name_prefix="bigmart-stack")
+        with warnings.catch_warnings():
+            # The base models were fitted on DataFrames; X is the same columns as an array
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            columns = list(self._executor.map(lambda model: predict_model(model, X), self.base_models))
+        return np.column_stack(columns)
+
+    def predict(self, X):
+        return self.blender.predict(self.base_predict(X))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
+
+
+def fit_blender(oof, y):
+    """Non-negative linear blender of an (n_rows, n_models) matrix of out-of-fold predictions."""
+    return LinearRegression(positive=True).fit(oof, y)
+
+
+def train_stacked_artifact(
+    source, names=DEFAULT_BASE_MODELS, model_params=None, cv=DEFAULT_CV, test_size=0.2, random_state=42,
+    cache=None, n_jobs=-1, workers=None,
+):
+    """(ModelArtifact with a StackedEnsemble, per-model summary DataFrame) on the notebook's 80/20 split."""
+    preprocessor, X_train, X_val, y_train, y_val = load_split(
+        source, test_size=test_size, random_state=random_state, cache=cache
+    )
+    results = base_predictions(
+        names, X_train, y_train, X_val, model_params=model_params, cv=cv, random_state=random_state, cache=cache,
+        n_jobs=n_jobs, workers=workers,
+    )
+    oof = np.column_stack([results[name]["oof"] for name in names])
+    blender = fit_blender(oof, y_train)
+    ensemble = StackedEnsemble(names, [results[name]["model"] for name in names], blender)
+    y_pred_val = blender.predict(np.column_stack([results[name]["val"] for name in names]))
+
+    summary = pd.DataFrame(
+        {
+            "OOF RMSE": [rmse(y_train, results[name]["oof"]) for name in names],
+            "Validation RMSE": [rmse(y_val, results[name]["val"]) for name in names],
+            "R² Score": [r2_score(y_val, results[name]["val"]) for name in names],
+            "Weight": [ensemble.weights[name] for name in names],
+        },
+        index=pd.Index(names, name="Model"),
+    )
+    summary.loc[STACKED_MODEL_NAME] = [
+        rmse(y_train, blender.predict(oof)), rmse(y_val, y_pred_val), r2_score(y_val, y_pred_val), np.nan,
+    ]
+
+    metadata = {
+        "model_params": {"base_models": list(names), "cv": cv, "params": model_params or {}},
+        "drift_reference": reference_histograms(X_train),
+        "train_rows": len(X_train),
+        "validation_rows": len(X_val),
+        "validation_rmse": rmse(y_val, y_pred_val),
+        "validation_r2": float(r2_score(y_val, y_pred_val)),
+        "blend_weights": {name: float(w) for name, w in ensemble.weights.items()},
+        "blend_intercept": float(blender.intercept_),
+    }
+    artifact = ModelArtifact(model=ensemble, preprocessor=preprocessor, model_name=STACKED_MODEL_NAME, metadata=metadata)
+    return artifact, summary
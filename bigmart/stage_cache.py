@@ -0,0 +1,111 @@
+"""Content-addressed on-disk cache for pipeline stage outputs.
+
+Every stage result is stored under a key hashed from the stage name, the key
+of its input (so keys chain back to the raw data), its parameters and the
+source code it runs. Changing only a model hyperparameter therefore changes
+only the fit key, and every upstream stage is read back instead of
+recomputed. The cache directory is kept under max_bytes by evicting the
+least recently used entries.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+
+import joblib
+import pandas as pd
+
+DEFAULT_CACHE_DIR = ".bigmart_cache"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def _sha256(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def file_key(path, block_size=1 << 20):
+    """Hash of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def frame_key(df):
+    """Hash of a DataFrame's values, index, columns and dtypes."""
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    return _sha256(row_hashes.tobytes(), list(df.columns), [str(t) for t in df.dtypes])
+
+
+def code_key(*objects):
+    """Hash of the source code of functions, classes or modules."""
+    return _sha256(*(inspect.getsource(obj) for obj in objects))
+
+
+class StageCache:
+    """Directory of joblib files named by stage and content key."""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(stage, input_key, params, code):
+        return _sha256(stage, input_key, json.dumps(params, sort_keys=True, default=str), code)
+
+    def path(self, stage, key):
+        return os.path.join(self.directory, f"{stage}-{key[:32]}.joblib")
+
+    def contains(self, stage, key):
+        return os.path.exists(self.path(stage, key))
+
+    def load(self, stage, key):
+        path = self.path(stage, key)
+        value = joblib.load(path)
+        os.utime(path)  # mark as recently used for eviction
+        self.hits += 1
+        return value
+
+    def store(self, stage, key, value):
+        self.misses += 1
+        path = self.path(stage, key)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        joblib.dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return value
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the directory fits in max_bytes.
+
+        The entry at path keep (the one just stored) is never deleted, even if
+        it alone is larger than max_bytes.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".joblib") and os.path.join(self.directory, name) != keep:
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries) + (os.path.getsize(keep) if keep else 0)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".joblib"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,48 @@
+"""Typed columnar storage for intermediate pipeline datasets.
+
+Stage outputs (encoded_data, X_train, X_val, y_train, y_val) are written as
+uncompressed Arrow IPC (Feather) files instead of CSV. Dtypes survive the
+round trip (one-hot booleans stay bool, categoricals keep their levels), and
+reloading memory-maps the file: numeric columns without nulls are handed to
+pandas without being copied or parsed. CSV export remains available through
+csv_path.
+
+pyarrow is optional for the rest of the package and only imported here.
+"""
+
+import pandas as pd
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+    except ImportError as exc:
+        raise ImportError("pyarrow is required for bigmart.storage (pip install pyarrow)") from exc
+    return pyarrow
+
+
+def save_frame(data, path, csv_path=None):
+    """Write a DataFrame (or Series) to a Feather file, optionally also to CSV."""
+    pa = _pyarrow()
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    # Keeps a non-default index (e.g. the shuffled train_test_split index) as a column
+    table = pa.Table.from_pandas(df, preserve_index=None)
+    pa.feather.write_feather(table, path, compression="uncompressed")
+    if csv_path is not None:
+        df.to_csv(csv_path, index=False)
+    return path
+
+
+def load_frame(path, memory_map=True):
+    """Read a Feather file written by save_frame back with its original dtypes."""
+    pa = _pyarrow()
+    table = pa.feather.read_table(path, memory_map=memory_map)
+    # One block per column, so numeric columns can stay views of the mapped file
+    return table.to_pandas(split_blocks=True)
+
+
+def load_series(path, memory_map=True):
+    """Read a single-column file written from a Series (e.g. y_train)."""
+    df = load_frame(path, memory_map=memory_map)
+    return df[df.columns[0]]
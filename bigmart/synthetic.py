@@ -0,0 +1,241 @@
+"""Synthetic BigMart data at any size, learned from the training file.
+
+    python -m bigmart.synthetic train_v9rqX0R.csv -o synthetic_train.csv --items 100000 --outlets 100
+    python -m bigmart.synthetic train_v9rqX0R.csv -o synthetic_test.csv --items 100000 --outlets 100 --no-target
+
+BigMartSynthesizer.fit learns from a raw training frame:
+
+- items: Item_Weight, fat content and Item_Type per Item_Identifier, with
+  its mean MRP and mean non-zero visibility;
+- outlets: the Outlet_* attributes per Outlet_Identifier, the share of its
+  rows with a missing Item_Weight or a zero visibility, and its observed
+  visibility ratios (row / item mean) and units sold (sales / MRP);
+- the MRP deviations of rows from their item's mean, and how often each fat
+  content is spelled "LF", "low fat", "reg", ...
+
+generate emits every item x outlet pair for n_items items and n_outlets
+outlets, in chunks of about chunk_rows rows, so writing 10M+ rows only
+holds one chunk in memory. Item i copies training item i mod (training
+items), outlet j copies training outlet j mod (training outlets). The first
+copy keeps the original identifiers; later copies get a "_k" suffix (as in
+bigmart.benchmark.expand_frame) and jittered MRP, weight, visibility and
+establishment year. Each row then draws its MRP deviation, visibility
+ratio, missingness and units sold from what was observed for its outlet,
+so per-group distributions, the MRP/sales relationship and missingness
+rates follow the training file.
+
+Chunks have the training columns in the same order, with the dtypes of
+read_raw_csv. The same arguments always produce the same data.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.utils.validation import check_is_fitted
+
+from bigmart.dtypes import read_raw_csv
+from bigmart.preprocessing import FAT_CONTENT_MAP, TARGET
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Relative jitter applied to copies of a training item
+MRP_JITTER = 0.1
+WEIGHT_JITTER = 0.05
+VISIBILITY_JITTER = 0.1
+# Years an outlet copy's establishment year may move
+YEAR_JITTER = 3
+
+
+def _pools(values, groups, n_groups):
+    """Values sorted by group, with each group's start offset and size."""
+    order = np.argsort(groups, kind="stable")
+    sizes = np.bincount(groups, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    return np.asarray(values, dtype=float)[order], starts, sizes
+
+
+def _draw(pools, groups, rng):
+    """One value per row, sampled from the pool of the row's group."""
+    values, starts, sizes = pools
+    return values[starts[groups] + (rng.random(len(groups)) * sizes[groups]).astype(np.int64)]
+
+
+def _copy_ids(ids, copy):
+    ids = pd.Series(ids)
+    return ids.where(copy == 0, ids + "_" + pd.Series(copy).astype(str)).to_numpy(dtype=object)
+
+
+def _jitter(rng, size, scale, copy):
+    return np.where(copy == 0, 1.0, rng.uniform(1 - scale, 1 + scale, size))
+
+
+class BigMartSynthesizer(BaseEstimator):
+    """Learns item, outlet and row distributions from raw training rows and generates more.
+
+    Fitted state:
+    - columns_: raw column order of the training frame
+    - items_: per Item_Identifier weight, fat content, type, mean MRP and mean visibility
+    - outlets_: per Outlet_Identifier attributes and missing-weight / zero-visibility rates
+    - fat_spellings_: {fat content: (raw labels, cumulative probabilities)}
+    - mrp_deviations_, visibility_ratios_, units_: pools sampled per row
+    """
+
+    def fit(self, df):
+        df = df.reset_index(drop=True)
+        self.columns_ = list(df.columns)
+        fat = df["Item_Fat_Content"].astype(str).replace(FAT_CONTENT_MAP)
+        visible = df["Item_Visibility"].where(df["Item_Visibility"] > 0)
+
+        by_item = df.groupby("Item_Identifier", observed=True, sort=True)
+        items = pd.DataFrame({
+            "Item_Weight": by_item["Item_Weight"].first(),
+            "Item_Fat_Content": fat.groupby(df["Item_Identifier"], observed=True).first(),
+            "Item_Type": by_item["Item_Type"].first().astype(str),
+            "Item_MRP": by_item["Item_MRP"].mean(),
+            "Item_Visibility": visible.groupby(df["Item_Identifier"], observed=True).mean(),
+        })
+        items["Item_Visibility"] = items["Item_Visibility"].fillna(visible.median())
+        items.index = items.index.astype(str)
+        self.items_ = items
+
+        by_outlet = df.groupby("Outlet_Identifier", observed=True, sort=True)
+        outlets = by_outlet[["Outlet_Establishment_Year", "Outlet_Size", "Outlet_Location_Type", "Outlet_Type"]].first()
+        outlets["weight_missing"] = df["Item_Weight"].isna().groupby(df["Outlet_Identifier"], observed=True).mean()
+        outlets["zero_visibility"] = visible.isna().groupby(df["Outlet_Identifier"], observed=True).mean()
+        outlets.index = outlets.index.astype(str)
+        self.outlets_ = outlets
+
+        self.fat_spellings_ = {}
+        for level, labels in df["Item_Fat_Content"].astype(str).groupby(fat).value_counts(normalize=True).groupby(level=0):
+            self.fat_spellings_[level] = (labels.index.get_level_values(1).to_numpy(), np.cumsum(labels.to_numpy()))
+
+        item_idx = items.index.get_indexer(df["Item_Identifier"].astype(str))
+        outlet_idx = outlets.index.get_indexer(df["Outlet_Identifier"].astype(str))
+        self.mrp_deviations_ = (df["Item_MRP"] - items["Item_MRP"].to_numpy()[item_idx]).to_numpy()
+        ratio = (visible / items["Item_Visibility"].to_numpy()[item_idx]).to_numpy()
+        seen = ~np.isnan(ratio)
+        self.visibility_ratios_ = _pools(ratio[seen], outlet_idx[seen], len(outlets))
+        if TARGET in df:
+            self.units_ = _pools((df[TARGET] / df["Item_MRP"]).to_numpy(), outlet_idx, len(outlets))
+        return self
+
+    def _outlets(self, n_outlets, rng):
+        template = np.arange(n_outlets) % len(self.outlets_)
+        copy = np.arange(n_outlets) // len(self.outlets_)
+        outlets = self.outlets_.iloc[template].reset_index()
+        outlets["Outlet_Identifier"] = _copy_ids(outlets["Outlet_Identifier"], copy)
+        year = outlets["Outlet_Establishment_Year"].to_numpy()
+        shift = np.where(copy == 0, 0, rng.integers(-YEAR_JITTER, YEAR_JITTER + 1, n_outlets))
+        outlets["Outlet_Establishment_Year"] = np.minimum(year + shift, self.outlets_["Outlet_Establishment_Year"].max())
+        outlets["template"] = template
+        return outlets
+
+    def _items(self, index, rng):
+        template = index % len(self.items_)
+        copy = index // len(self.items_)
+        items = self.items_.iloc[template].reset_index()
+        items["Item_Identifier"] = _copy_ids(items["Item_Identifier"], copy)
+        items["Item_MRP"] *= _jitter(rng, len(items), MRP_JITTER, copy)
+        items["Item_Weight"] *= _jitter(rng, len(items), WEIGHT_JITTER, copy)
+        items["Item_Visibility"] *= _jitter(rng, len(items), VISIBILITY_JITTER, copy)
+        return items
+
+    def _fat_content(self, canonical, rng):
+        u = rng.random(len(canonical))
+        spelled = np.empty(len(canonical), dtype=object)
+        for level, (labels, cumulative) in self.fat_spellings_.items():
+            rows = canonical == level
+            spelled[rows] = labels[np.minimum(np.searchsorted(cumulative, u[rows], side="right"), len(labels) - 1)]
+        return spelled
+
+    def _rows(self, items, outlets, rng, target):
+        n_rows = len(items) * len(outlets)
+        order = rng.permutation(n_rows)
+        item_idx = order // len(outlets)
+        outlet_idx = order % len(outlets)
+        template = outlets["template"].to_numpy()[outlet_idx]
+
+        weight = items["Item_Weight"].to_numpy()[item_idx]
+        weight = np.where(rng.random(n_rows) < outlets["weight_missing"].to_numpy()[outlet_idx], np.nan, weight)
+        visibility = items["Item_Visibility"].to_numpy()[item_idx] * _draw(self.visibility_ratios_, template, rng)
+        visibility[rng.random(n_rows) < outlets["zero_visibility"].to_numpy()[outlet_idx]] = 0.0
+        mrp = items["Item_MRP"].to_numpy()[item_idx] + self.mrp_deviations_[rng.integers(0, len(self.mrp_deviations_), n_rows)]
+
+        columns = {
+            "Item_Identifier": pd.Categorical.from_codes(item_idx, categories=items["Item_Identifier"]),
+            "Item_Weight": weight.round(3),
+            "Item_Fat_Content": pd.Categorical(self._fat_content(items["Item_Fat_Content"].to_numpy()[item_idx], rng)),
+            "Item_Visibility": visibility.round(9),
+            "Item_Type": pd.Categorical(items["Item_Type"].to_numpy()[item_idx]),
+            "Item_MRP": mrp.round(4),
+            "Outlet_Identifier": pd.Categorical.from_codes(outlet_idx, categories=outlets["Outlet_Identifier"]),
+            "Outlet_Establishment_Year": outlets["Outlet_Establishment_Year"].to_numpy(dtype=np.int16)[outlet_idx],
+        }
+        for col in ("Outlet_Size", "Outlet_Location_Type", "Outlet_Type"):
+            columns[col] = pd.Categorical(outlets[col].to_numpy(dtype=object)[outlet_idx])
+        if target:
+            columns[TARGET] = (mrp * _draw(self.units_, template, rng)).round(4)
+        return pd.DataFrame({col: columns[col] for col in self.columns_ if col in columns})
+
+    def generate(self, n_items, n_outlets, chunk_rows=DEFAULT_CHUNK_ROWS, random_state=42, target=True):
+        """Yield raw frames covering every item x outlet pair, about chunk_rows rows each."""
+        check_is_fitted(self, "items_")
+        if target and not hasattr(self, "units_"):
+            raise ValueError(f"fitted without {TARGET}; generate with target=False")
+        outlets = self._outlets(n_outlets, np.random.default_rng([random_state, 0]))
+        items_per_chunk = max(1, chunk_rows // n_outlets)
+        for chunk, start in enumerate(range(0, n_items, items_per_chunk)):
+            rng = np.random.default_rng([random_state, chunk + 1])
+            items = self._items(np.arange(start, min(start + items_per_chunk, n_items)), rng)
+            yield self._rows(items, outlets, rng, target)
+
+    def write_csv(self, path, n_items, n_outlets, chunk_rows=DEFAULT_CHUNK_ROWS, random_state=42, target=True):
+        """Stream generated rows to a CSV file; returns the number of rows written.
+
+        Uses pyarrow's CSV writer when it is installed (several times faster
+        than DataFrame.to_csv), and pandas otherwise.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.csv
+        except ImportError:
+            pa = None
+        n_rows = 0
+        with open(path, "wb") as f:
+            for chunk in self.generate(n_items, n_outlets, chunk_rows, random_state, target):
+                if pa is not None:
+                    options = pa.csv.WriteOptions(include_header=n_rows == 0)
+                    pa.csv.write_csv(pa.Table.from_pandas(chunk, preserve_index=False), f, options)
+                else:
+                    chunk.to_csv(f, header=n_rows == 0, index=False)
+                n_rows += len(chunk)
+        return n_rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("train_csv", help="raw training CSV to learn from")
+    parser.add_argument("-o", "--output", default="synthetic_train.csv")
+    parser.add_argument("--items", type=int, default=None, help="defaults to the training item count")
+    parser.add_argument("--outlets", type=int, default=None, help="defaults to the training outlet count")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="rows generated per chunk")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-target", action="store_true", help=f"omit {TARGET}, like the test file")
+    args = parser.parse_args(argv)
+
+    synthesizer = BigMartSynthesizer().fit(read_raw_csv(args.train_csv))
+    n_items = args.items or len(synthesizer.items_)
+    n_outlets = args.outlets or len(synthesizer.outlets_)
+    print(f"🔄 Generating {n_items:,} items x {n_outlets:,} outlets = {n_items * n_outlets:,} rows... ⏳")
+    n_rows = synthesizer.write_csv(
+        args.output, n_items, n_outlets, chunk_rows=args.chunk_rows, random_state=args.seed, target=not args.no_target
+    )
+    print(f"✅ {n_rows:,} rows saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
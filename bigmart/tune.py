@@ -0,0 +1,76 @@
+"""Tune a notebook model (see bigmart.tuning).
+
+    python -m bigmart.tune train_v9rqX0R.csv --model LightGBM --n-candidates 81
+    python -m bigmart.tune train_v9rqX0R.csv --model "Gradient Boosting" --resource n_samples
+
+    # The notebook's grid, fitting each tree-count series once per fold
+    python -m bigmart.tune train_v9rqX0R.csv --model "Gradient Boosting" --strategy staged --n-candidates 15
+
+The preprocessed 80/20 split comes from the stage cache, so repeated tuning
+runs skip straight to the search.
+"""
+
+import argparse
+
+
+from bigmart import profiling
+from bigmart.metrics import rmse
+from bigmart.models import DEFAULT_MODEL
+from bigmart.pipeline import load_split
+from bigmart.stage_cache import DEFAULT_CACHE_DIR, StageCache
+from bigmart.tuning import NOTEBOOK_PARAM_DIST, staged_search, successive_halving_search
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("train_csv")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--strategy", choices=["halving", "staged"], default="halving")
+    parser.add_argument("--n-candidates", type=int, default=None,
+                        help="candidates to sample (halving default 81; staged default: full grid)")
+    parser.add_argument("--resource", choices=["n_estimators", "n_samples"], default="n_estimators")
+    parser.add_argument("--min-resource", type=int, default=None)
+    parser.add_argument("--max-resource", type=int, default=None)
+    parser.add_argument("--factor", type=int, default=3)
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--prune-margin", type=float, default=0.05)
+    parser.add_argument("--results", default="tuning_results.csv")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    profiling.configure_from_args(args)
+
+    cache = None if args.no_cache else StageCache(args.cache_dir)
+    _, X_train, X_val, y_train, y_val = load_split(args.train_csv, cache=cache)
+
+    if args.strategy == "staged":
+        print(f"🔄 Staged search over the notebook grid for {args.model}... ⏳")
+        result = staged_search(args.model, X_train, y_train, NOTEBOOK_PARAM_DIST, n_iter=args.n_candidates, cv=args.cv)
+    else:
+        n_candidates = args.n_candidates or 81
+        print(f"🔄 Successive halving over {n_candidates} {args.model} candidates ({args.resource})... ⏳")
+        result = successive_halving_search(
+            args.model,
+            X_train,
+            y_train,
+            n_candidates=n_candidates,
+            resource=args.resource,
+            min_resource=args.min_resource,
+            max_resource=args.max_resource,
+            factor=args.factor,
+            cv=args.cv,
+            prune_margin=args.prune_margin,
+        )
+    result.results.to_csv(args.results, index=False)
+
+    val_rmse = rmse(y_val, result.best_estimator.predict(X_val))
+    print(f"\n✅ Best Hyperparameters Found: {result.best_params}")
+    print(f"📊 CV RMSE: {result.best_rmse:.2f}, Validation RMSE: {val_rmse:.2f}")
+    if "pruned" in result.results:
+        print(f"✂️ {len(result.results)} trials, {int(result.results['pruned'].sum())} stopped early")
+    print(f"💾 Results saved to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
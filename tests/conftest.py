@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from bigmart.dtypes import read_raw_csv
+from bigmart.pipeline import train_artifact
+
+DATA_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def artifact():
+    return train_artifact(DATA_DIR / "train_v9rqX0R.csv")
+
+
+@pytest.fixture(scope="session")
+def test_df():
+    return read_raw_csv(DATA_DIR / "test_AbJTz2l.csv")
+
+
+@pytest.fixture(scope="session")
+def train_df():
+    return pd.read_csv(DATA_DIR / "train_v9rqX0R.csv")
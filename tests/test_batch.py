@@ -0,0 +1,50 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_info
+
+from bigmart import batch
+from bigmart.artifact import save_artifact
+from bigmart.predict import ID_COLUMNS, predict_frame
+
+
+def _threads_while_scoring(chunk):
+    """num_threads LightGBM is called with, and the OpenMP limits in force, during a worker's predict."""
+    seen = {}
+    booster = batch._worker_artifact.model.booster_
+    predict = booster.predict
+
+    def spy(X, **kwargs):
+        seen["num_threads"] = kwargs.get("num_threads")
+        seen["openmp"] = {info["num_threads"] for info in threadpool_info() if info["user_api"] == "openmp"}
+        return predict(X, **kwargs)
+
+    booster.predict = spy
+    batch._predict_shard(chunk)
+    return seen
+
+
+def test_workers_predict_on_one_thread(tmp_path, artifact, test_df):
+    path = save_artifact(artifact, tmp_path / "model.joblib")
+    with ProcessPoolExecutor(1, initializer=batch._init_worker, initargs=(path,)) as pool:
+        seen = pool.submit(_threads_while_scoring, test_df.head(100)).result()
+    assert seen["num_threads"] == 1
+    assert seen["openmp"] == {1}
+
+
+def test_parallel_and_chunked_scoring_keep_row_order(tmp_path, artifact, test_df):
+    input_csv = tmp_path / "test.csv"
+    test_df.to_csv(input_csv, index=False)
+    expected = predict_frame(artifact, test_df)
+    path = save_artifact(artifact, tmp_path / "model.joblib")
+
+    chunked = tmp_path / "chunked.csv"
+    assert batch.score_csv_in_chunks(artifact, input_csv, chunked, chunksize=1000) == len(test_df)
+    parallel = tmp_path / "parallel.csv"
+    assert batch.score_csv_parallel(path, input_csv, parallel, chunksize=500, n_jobs=2) == len(test_df)
+
+    for output in (chunked, parallel):
+        scored = pd.read_csv(output)
+        assert scored[ID_COLUMNS].values.tolist() == expected[ID_COLUMNS].values.tolist()
+        assert np.allclose(scored["Item_Outlet_Sales"], expected["Item_Outlet_Sales"])
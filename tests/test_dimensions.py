@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def full_predict(artifact, df):
+    return artifact.predict_matrix(artifact.preprocessor.transform(df).to_numpy(dtype=float))
+
+
+def with_value(df, column, value, rows=slice(None, None, 3)):
+    df = df.copy()
+    if hasattr(df[column], "cat") and pd.notna(value) and value not in df[column].cat.categories:
+        df[column] = df[column].cat.add_categories([value])
+    df.loc[rows, column] = value
+    return df
+
+
+def test_gathered_rows_match_full_transform(artifact, test_df):
+    np.testing.assert_array_equal(artifact.predict(test_df), full_predict(artifact, test_df))
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [
+        ("Outlet_Type", "Grocery Store"),
+        ("Outlet_Size", "High"),
+        ("Outlet_Size", np.nan),
+        ("Outlet_Location_Type", "Tier 1"),
+        ("Outlet_Establishment_Year", 1990),
+        ("Item_Type", "Dairy"),
+        ("Item_Fat_Content", "reg"),
+    ],
+)
+def test_known_ids_with_changed_attributes(artifact, test_df, column, value):
+    df = with_value(test_df, column, value)
+    np.testing.assert_array_equal(artifact.predict(df), full_predict(artifact, df))
+    np.testing.assert_array_equal(artifact.predict(df), artifact.predict_records(df.to_dict("records")))
+
+
+def test_unchanged_rows_are_gathered(artifact, test_df):
+    item_codes, outlet_codes = artifact.dimensions.codes(test_df)
+    assert artifact.dimensions.matches(test_df, item_codes, outlet_codes).all()
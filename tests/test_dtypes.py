@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+from bigmart.dtypes import read_raw_csv
+
+
+@pytest.fixture
+def csv_missing_mrp(tmp_path, test_df):
+    df = test_df.head(30).copy()
+    df.loc[[17, 25], "Item_MRP"] = None
+    path = tmp_path / "missing_mrp.csv"
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "c"])
+def test_chunk_errors_name_file_rows(csv_missing_mrp, engine):
+    chunks = read_raw_csv(csv_missing_mrp, engine=engine, chunksize=10)
+    assert len(next(chunks)) == 10
+    with pytest.raises(ValueError, match=r"data rows 17\)"):
+        next(chunks)
+
+
+@pytest.mark.parametrize("engine", ["pyarrow", "c"])
+def test_skipped_rows_keep_file_row_numbers(csv_missing_mrp, engine):
+    chunks = list(read_raw_csv(csv_missing_mrp, engine=engine, chunksize=10, on_bad_lines="skip"))
+    eager = read_raw_csv(csv_missing_mrp, engine=engine, on_bad_lines="skip")
+    expected = [row for row in range(30) if row not in (17, 25)]
+    assert pd.concat(chunks).index.tolist() == expected
+    assert eager.index.tolist() == expected
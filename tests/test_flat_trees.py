@@ -0,0 +1,22 @@
+import numpy as np
+
+from bigmart.flat_trees import flatten_artifact, flatten_model
+
+
+def test_flat_trees_match_native_booster(artifact, test_df):
+    X = np.asarray(artifact.dimensions.transform(test_df), dtype=np.float64)
+    flat = flatten_model(artifact.model)
+    assert np.array_equal(flat.predict(X), artifact.model.booster_.predict(X))
+
+
+def test_flat_trees_send_missing_values_the_native_way(artifact, test_df):
+    X = np.asarray(artifact.dimensions.transform(test_df.head(500)), dtype=np.float64)
+    X[::3, ::2] = np.nan
+    flat = flatten_model(artifact.model)
+    assert np.array_equal(flat.predict(X), artifact.model.booster_.predict(X))
+
+
+def test_flattened_artifact_predicts_like_the_original(artifact, test_df):
+    flat = flatten_artifact(artifact)
+    assert flat.metadata["flattened_from"] == type(artifact.model).__name__
+    assert np.array_equal(flat.predict(test_df), artifact.predict(test_df))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from bigmart.incremental import update_artifact
+from bigmart.pipeline import train_artifact
+from bigmart.stacking import STACKED_MODEL_NAME, train_stacked_artifact
+
+
+def test_partial_fit_refreshes_known_identifiers(artifact, train_df):
+    batch = train_df.head(500).copy()
+    outlet = batch["Outlet_Identifier"].iloc[0]
+    batch.loc[batch["Outlet_Identifier"] == outlet, "Outlet_Size"] = "High"
+
+    updated, _, action = update_artifact(artifact, batch, update_trees=5)
+
+    assert action == "updated"
+    outlets = updated.preprocessor.outlet_attributes_
+    assert outlets.loc[outlet, "Outlet_Size"] == "High"
+    assert list(outlets.index) == list(artifact.preprocessor.outlet_attributes_.index)
+    X = updated.preprocessor.transform(batch.copy()).to_numpy(dtype=float)
+    np.testing.assert_array_equal(updated.predict(batch.copy()), updated.predict_matrix(X))
+
+
+def test_rebuild_keeps_update_history(train_df):
+    history, new_rows = train_df.iloc[1000:], train_df.iloc[:1000]
+    artifact = train_artifact(history, model_name="Linear Regression")
+    artifact.metadata["updates"] = [{"rows": 1}]
+
+    rebuilt, _, action = update_artifact(artifact, new_rows, history=history, force_rebuild=True)
+
+    assert action == "rebuilt"
+    assert rebuilt.metadata["updates"][0] == {"rows": 1}
+    assert rebuilt.metadata["updates"][-1]["rebuilt"] is True
+
+
+def test_stacked_artifact_is_rebuilt_with_its_base_models(train_df):
+    history, new_rows = train_df.iloc[1000:], train_df.iloc[:1000]
+    names = ["Linear Regression", "Decision Tree"]
+    artifact, _ = train_stacked_artifact(history, names=names, cv=2)
+
+    with pytest.raises(ValueError, match="stacked ensemble"):
+        update_artifact(artifact, new_rows)
+    rebuilt, _, action = update_artifact(artifact, new_rows, history=history)
+
+    assert action == "rebuilt"
+    assert rebuilt.model_name == STACKED_MODEL_NAME
+    assert rebuilt.model.names == names
+    assert rebuilt.metadata["model_params"]["cv"] == 2
@@ -0,0 +1,54 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import wait
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from bigmart.artifact import save_artifact
+from bigmart.serve import MicroBatcher, ServedModel, make_handler
+
+
+def test_bad_record_only_fails_its_own_request(artifact, test_df):
+    records = test_df.head(20).to_dict("records")
+    batcher = MicroBatcher(artifact.predict_records, max_batch_size=64, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(record) for record in records[:10]]
+        bad = batcher.submit({"Item_Identifier": "FDA15"})
+        futures += [batcher.submit(record) for record in records[10:]]
+        wait([*futures, bad], timeout=30)
+    finally:
+        batcher.close()
+
+    # The record has no Item_MRP, Item_Visibility, ...: the layout's arithmetic fails on None
+    with pytest.raises(TypeError):
+        bad.result()
+    assert [future.result() for future in futures] == pytest.approx(list(artifact.predict(test_df.head(20))))
+
+
+def test_reload_rejects_client_paths(tmp_path, artifact):
+    served = ServedModel(save_artifact(artifact, tmp_path / "model.joblib"))
+    batcher = MicroBatcher(served.predict_records)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(batcher, served))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/reload"
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=b"", method="POST")) as response:
+            assert json.loads(response.read())["model_key"] == served.model_key
+        other = json.dumps({"artifact": str(tmp_path / "other.joblib")}).encode()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(urllib.request.Request(url, data=other, method="POST"))
+        assert error.value.code == 400
+        assert served.path == tmp_path / "model.joblib"
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+
+
+def test_predict_records_matches_predict(artifact, test_df):
+    rows = test_df.head(200)
+    assert np.array_equal(artifact.predict_records(rows.to_dict("records")), artifact.predict(rows))
@@ -0,0 +1,18 @@
+import numpy as np
+
+from bigmart.simulation import price_response
+
+
+def test_multipliers_match_predict_on_repriced_rows(artifact, test_df):
+    rows = test_df.head(300)
+    response = price_response(artifact, rows, multipliers=[0.5, 1.0, 1.5], block_rows=200)
+    for point, multiplier in enumerate(response.grid):
+        repriced = rows.assign(Item_MRP=rows["Item_MRP"] * multiplier)
+        assert np.array_equal(response.sales[:, point], artifact.predict(repriced))
+
+
+def test_prices_match_predict_at_a_fixed_mrp(artifact, test_df):
+    rows = test_df.head(300)
+    response = price_response(artifact, rows, prices=[60.0, 180.0])
+    for point, price in enumerate(response.grid):
+        assert np.array_equal(response.sales[:, point], artifact.predict(rows.assign(Item_MRP=price)))
@@ -0,0 +1,12 @@
+import numpy as np
+
+from bigmart.stage_cache import StageCache
+
+
+def test_store_keeps_the_entry_it_just_wrote(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=1)
+    cache.store("fit", "a" * 64, np.zeros(1000))
+    cache.store("fit", "b" * 64, np.ones(1000))
+    assert not cache.contains("fit", "a" * 64)
+    assert cache.contains("fit", "b" * 64)
+    assert np.array_equal(cache.load("fit", "b" * 64), np.ones(1000))
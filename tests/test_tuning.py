@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from sklearn.model_selection import KFold
+
+from bigmart.fold_cache import FoldCache
+from bigmart.models import make_model
+
+PARAMS = {"learning_rate": 0.1, "max_depth": 3, "subsample": 0.8}
+
+
+@pytest.fixture(scope="module")
+def train_matrix(artifact, train_df):
+    rows = train_df.head(2000)
+    X = np.asarray(artifact.dimensions.transform(rows), dtype=np.float64)
+    return X, rows["Item_Outlet_Sales"].to_numpy(dtype=float)
+
+
+@pytest.mark.parametrize("model_name", ["LightGBM", "XGBoost", "Gradient Boosting"])
+def test_fold_cache_fits_like_the_sklearn_wrapper(train_matrix, model_name):
+    X, y = train_matrix
+    folds = list(KFold(n_splits=2, shuffle=True, random_state=42).split(X))
+    fold_cache = FoldCache(model_name, X, y, folds)
+    train_idx, test_idx = folds[0]
+    model = make_model(model_name, **PARAMS, n_estimators=50)
+    model.fit(fold_cache.X[train_idx], y[train_idx])
+    expected = model.predict(fold_cache.X[test_idx])
+    assert np.array_equal(fold_cache.fit_predict(PARAMS, 0, n_estimators=50), expected)
+
+
+@pytest.mark.parametrize("model_name", ["LightGBM", "XGBoost", "Gradient Boosting"])
+def test_staged_predictions_match_separate_fits(train_matrix, model_name):
+    X, y = train_matrix
+    folds = list(KFold(n_splits=2, shuffle=True, random_state=42).split(X))
+    fold_cache = FoldCache(model_name, X, y, folds)
+    staged = fold_cache.fit_predict(PARAMS, 1, tree_counts=[10, 30, 50])
+    assert sorted(staged) == [10, 30, 50]
+    for n, pred in staged.items():
+        assert np.array_equal(pred, fold_cache.fit_predict(PARAMS, 1, n_estimators=n))
+    assert fold_cache.builds == 1